@@ -1,6 +1,7 @@
 import logging
 import math
 import struct
+from collections.abc import Callable
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -81,6 +82,15 @@ POSE_FLAG_LEFT_VALID = 1 << 4
 POSE_FLAG_VIRTUALS_VALID = 1 << 5
 POSE_FLAG_MOVING_FLOOR_LOCAL = 1 << 6
 
+# Precompiled layouts for the inbound pose body (the hottest parse path)
+_unpack_u16 = struct.Struct("<H").unpack_from
+_unpack_u32 = struct.Struct("<I").unpack_from
+_unpack_physical_delta = struct.Struct("<hhhh").unpack_from
+# Relative position (3 x int16) followed by packed smallest-three rotation
+_unpack_rel_transform = struct.Struct("<hhhI").unpack_from
+# Device ID mapping entry head: client number, stealth flag, device ID length
+_pack_id_mapping_head = struct.Struct("<HBB").pack
+
 
 def _compute_encoding_flags(flags: int) -> int:
     """Return pose encoding flags for the sanitized pose flags."""
@@ -697,10 +707,16 @@ def serialize_device_id_mapping(
     buffer.extend(struct.pack("<H", len(mappings)))
 
     # Each mapping
+    extend = buffer.extend
     for client_no, device_id, is_stealth in mappings:
-        buffer.extend(struct.pack("<H", client_no))
-        buffer.append(0x01 if is_stealth else 0x00)  # Stealth flag (1 byte)
-        _pack_string(buffer, device_id)
+        device_id_bytes = device_id.encode("utf-8")
+        # Stealth flag is 1 byte; the device ID has a 1-byte length prefix
+        extend(
+            _pack_id_mapping_head(
+                client_no, 0x01 if is_stealth else 0x00, len(device_id_bytes)
+            )
+        )
+        extend(device_id_bytes)
 
     return bytes(buffer)
 
@@ -757,6 +773,27 @@ def serialize_global_var_sync(data: dict[str, Any]) -> bytes:
     return bytes(buffer)
 
 
+def _pack_var_store(buffer: bytearray, variables: dict[str, dict[str, Any]]) -> None:
+    """Pack a count-prefixed ``name -> {value, lastWriterClientNo}`` store."""
+    buffer.extend(struct.pack("<H", len(variables)))
+    for name, var in variables.items():
+        _pack_string(buffer, name[:64])
+        _pack_string(buffer, var.get("value", "")[:1024], use_ushort=True)
+        buffer.extend(struct.pack("<H", var.get("lastWriterClientNo", 0)))
+
+
+def serialize_global_var_sync_from_store(variables: dict[str, dict[str, Any]]) -> bytes:
+    """Serialize a global variable sync straight from the server's variable store.
+
+    Produces the same bytes as serialize_global_var_sync without building the
+    intermediate list of per-variable dicts.
+    """
+    buffer = bytearray()
+    buffer.append(MSG_GLOBAL_VAR_SYNC)
+    _pack_var_store(buffer, variables)
+    return bytes(buffer)
+
+
 def serialize_client_var_set(data: dict[str, Any]) -> bytes:
     """Serialize client variable set message
 
@@ -839,6 +876,23 @@ def serialize_client_var_sync(data: dict[str, Any]) -> bytes:
     return bytes(buffer)
 
 
+def serialize_client_var_sync_from_store(
+    clients: list[tuple[int, dict[str, dict[str, Any]]]],
+) -> bytes:
+    """Serialize a client variable sync straight from the server's variable store.
+
+    Args:
+        clients: (client_no, variable store) pairs, one per synced client
+    """
+    buffer = bytearray()
+    buffer.append(MSG_CLIENT_VAR_SYNC)
+    buffer.extend(struct.pack("<H", len(clients)))
+    for client_no, variables in clients:
+        buffer.extend(struct.pack("<H", client_no))
+        _pack_var_store(buffer, variables)
+    return bytes(buffer)
+
+
 def deserialize(data: bytes) -> tuple[int, dict[str, Any] | None, bytes]:
     """Deserialize binary data to message type, data, and raw payload
 
@@ -853,9 +907,10 @@ def deserialize(data: bytes) -> tuple[int, dict[str, Any] | None, bytes]:
     message_type = data[offset]
     offset += 1
 
-    # Validate message type is within valid range
-    if message_type < MSG_CLIENT_TRANSFORM or message_type > MSG_CLIENT_HELLO:
-        # Return invalid message type with None data instead of raising exception
+    # Unknown and reserved types (MSG_RPC_SERVER, MSG_RPC_CLIENT) have no parser;
+    # return None data instead of raising an exception.
+    parser = _DESERIALIZERS.get(message_type)
+    if parser is None:
         return message_type, None, b""
 
     try:
@@ -863,55 +918,8 @@ def deserialize(data: bytes) -> tuple[int, dict[str, Any] | None, bytes]:
             device_id_len = data[offset + 1]
             body_offset = offset + 2 + device_id_len
             raw_client_data = data[body_offset:]
-            return (
-                message_type,
-                _deserialize_client_transform(data, offset),
-                raw_client_data,
-            )
-        elif message_type == MSG_ROOM_POSE:
-            return message_type, _deserialize_room_transform(data, offset), b""
-        elif message_type == MSG_RPC:
-            return message_type, _deserialize_rpc_message(data, offset), b""
-        # MSG_RPC_SERVER and MSG_RPC_CLIENT are reserved for future use
-        elif message_type == MSG_DEVICE_ID_MAPPING:
-            return message_type, _deserialize_device_id_mapping(data, offset), b""
-        elif message_type == MSG_GLOBAL_VAR_SET:
-            return message_type, _deserialize_global_var_set(data, offset), b""
-        elif message_type == MSG_GLOBAL_VAR_SYNC:
-            return message_type, _deserialize_global_var_sync(data, offset), b""
-        elif message_type == MSG_CLIENT_VAR_SET:
-            return message_type, _deserialize_client_var_set(data, offset), b""
-        elif message_type == MSG_CLIENT_VAR_SYNC:
-            return message_type, _deserialize_client_var_sync(data, offset), b""
-        elif message_type == MSG_CLIENT_VAR_CLEAR:
-            return message_type, _deserialize_client_var_clear(data, offset), b""
-        elif message_type == MSG_CLIENT_HELLO:
-            return message_type, _deserialize_client_hello(data, offset), b""
-        elif message_type == MSG_OBJECT_POSE:
-            return message_type, _deserialize_object_pose(data, offset), b""
-        elif message_type == MSG_ROOM_OBJECTS:
-            return message_type, _deserialize_room_objects(data, offset), b""
-        elif message_type == MSG_OBJECT_OWNERSHIP_REQUEST:
-            return (
-                message_type,
-                _deserialize_object_ownership_request(data, offset),
-                b"",
-            )
-        elif message_type == MSG_OBJECT_OWNERSHIP_CHANGED:
-            return (
-                message_type,
-                _deserialize_object_ownership_changed(data, offset),
-                b"",
-            )
-        elif message_type == MSG_OBJECT_OWNERSHIP_REJECTED:
-            return (
-                message_type,
-                _deserialize_object_ownership_rejected(data, offset),
-                b"",
-            )
-        else:
-            # Should not reach here due to validation above
-            return message_type, None, b""
+            return message_type, parser(data, offset), raw_client_data
+        return message_type, parser(data, offset), b""
     except Exception as e:
         logger.warning(
             "Deserialization failed for message type %d: %s",
@@ -940,7 +948,7 @@ def _deserialize_client_hello(data: bytes, offset: int) -> dict[str, Any]:
 def _deserialize_client_body(data: bytes, offset: int) -> tuple[dict[str, Any], int]:
     """Deserialize protocol v5 compact pose body."""
     result: dict[str, Any] = {}
-    result["poseSeq"] = struct.unpack("<H", data[offset : offset + 2])[0]
+    result["poseSeq"] = _unpack_u16(data, offset)[0]
     offset += 2
     flags = data[offset]
     result["flags"] = flags
@@ -978,7 +986,7 @@ def _deserialize_client_body(data: bytes, offset: int) -> tuple[dict[str, Any],
             raise ValueError(
                 "PhysicalValid set but XROrigin delta encoding flag is missing"
             )
-        dx_q, dy_q, dz_q, dyaw_q = struct.unpack("<hhhh", data[offset : offset + 8])
+        dx_q, dy_q, dz_q, dyaw_q = _unpack_physical_delta(data, offset)
         if not moving_floor_local:
             xr_origin_delta_x = _dequantize_signed(dx_q, LOCO_POS_SCALE)
             xr_origin_delta_y = _dequantize_signed(dy_q, LOCO_POS_SCALE)
@@ -990,7 +998,7 @@ def _deserialize_client_body(data: bytes, offset: int) -> tuple[dict[str, Any],
         hx_q, offset = _unpack_int24_le(data, offset)
         hy_q, offset = _unpack_int24_le(data, offset)
         hz_q, offset = _unpack_int24_le(data, offset)
-        packed_head = struct.unpack("<I", data[offset : offset + 4])[0]
+        packed_head = _unpack_u32(data, offset)[0]
         offset += 4
         head_pos = (
             _dequantize_signed(hx_q, ABS_POS_SCALE),
@@ -1057,10 +1065,8 @@ def _deserialize_client_body(data: bytes, offset: int) -> tuple[dict[str, Any],
         )
 
     if right_valid:
-        rx_q, ry_q, rz_q = struct.unpack("<hhh", data[offset : offset + 6])
-        offset += 6
-        packed_rel = struct.unpack("<I", data[offset : offset + 4])[0]
-        offset += 4
+        rx_q, ry_q, rz_q, packed_rel = _unpack_rel_transform(data, offset)
+        offset += 10
         rel_pos = (
             _dequantize_signed(rx_q, REL_POS_SCALE),
             _dequantize_signed(ry_q, REL_POS_SCALE),
@@ -1086,10 +1092,8 @@ def _deserialize_client_body(data: bytes, offset: int) -> tuple[dict[str, Any],
         )
 
     if left_valid:
-        lx_q, ly_q, lz_q = struct.unpack("<hhh", data[offset : offset + 6])
-        offset += 6
-        packed_rel = struct.unpack("<I", data[offset : offset + 4])[0]
-        offset += 4
+        lx_q, ly_q, lz_q, packed_rel = _unpack_rel_transform(data, offset)
+        offset += 10
         rel_pos = (
             _dequantize_signed(lx_q, REL_POS_SCALE),
             _dequantize_signed(ly_q, REL_POS_SCALE),
@@ -1126,10 +1130,8 @@ def _deserialize_client_body(data: bytes, offset: int) -> tuple[dict[str, Any],
             virtual_count,
         )
     for _ in range(virtual_count):
-        vx_q, vy_q, vz_q = struct.unpack("<hhh", data[offset : offset + 6])
-        offset += 6
-        packed_rel = struct.unpack("<I", data[offset : offset + 4])[0]
-        offset += 4
+        vx_q, vy_q, vz_q, packed_rel = _unpack_rel_transform(data, offset)
+        offset += 10
         if virtual_valid:
             rel_pos = (
                 _dequantize_signed(vx_q, REL_POS_SCALE),
@@ -1595,3 +1597,23 @@ def _deserialize_object_ownership_rejected(data: bytes, offset: int) -> dict[str
     result["reasonCode"] = data[offset]
     offset += 1
     return result
+
+
+# Message type -> body parser, used by deserialize() instead of an if/elif chain.
+_DESERIALIZERS: dict[int, Callable[[bytes, int], dict[str, Any]]] = {
+    MSG_CLIENT_POSE: _deserialize_client_transform,
+    MSG_ROOM_POSE: _deserialize_room_transform,
+    MSG_RPC: _deserialize_rpc_message,
+    MSG_DEVICE_ID_MAPPING: _deserialize_device_id_mapping,
+    MSG_GLOBAL_VAR_SET: _deserialize_global_var_set,
+    MSG_GLOBAL_VAR_SYNC: _deserialize_global_var_sync,
+    MSG_CLIENT_VAR_SET: _deserialize_client_var_set,
+    MSG_CLIENT_VAR_SYNC: _deserialize_client_var_sync,
+    MSG_CLIENT_VAR_CLEAR: _deserialize_client_var_clear,
+    MSG_CLIENT_HELLO: _deserialize_client_hello,
+    MSG_OBJECT_POSE: _deserialize_object_pose,
+    MSG_ROOM_OBJECTS: _deserialize_room_objects,
+    MSG_OBJECT_OWNERSHIP_REQUEST: _deserialize_object_ownership_request,
+    MSG_OBJECT_OWNERSHIP_CHANGED: _deserialize_object_ownership_changed,
+    MSG_OBJECT_OWNERSHIP_REJECTED: _deserialize_object_ownership_rejected,
+}
@@ -20,6 +20,7 @@ import socket
 import threading
 import time
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 from queue import Empty, Full, Queue
@@ -147,6 +148,8 @@ class net_sync_manager:
         queue_max: int = 10000,
         reconnect_delay: float = 5.0,
         receive_timeout: float | None = 30.0,
+        coalesce_nv_events: bool = False,
+        context: zmq.Context | None = None,
     ):
         """
         Initialize NetSync client manager.
@@ -162,6 +165,11 @@ class net_sync_manager:
             reconnect_delay: Seconds to wait before a reconnect attempt (default: 5.0)
             receive_timeout: Seconds of server silence before triggering reconnect
                 (default: 30.0; pass None to disable silence detection)
+            coalesce_nv_events: If True, queued Network Variable change events
+                are coalesced per variable so dispatch_pending_events() only
+                delivers the net change since the last dispatch (default: False)
+            context: Shared ZeroMQ context to create sockets on. The caller owns
+                it and it is not terminated on stop (default: a private context)
         """
         self._server = server
         self._control_port = dealer_port
@@ -177,6 +185,7 @@ class net_sync_manager:
         self._receive_timeout = receive_timeout
 
         # ZeroMQ context and sockets
+        self._shared_context = context
         self._context: zmq.Context | None = None
         self._dealer_socket: zmq.Socket | None = None
         self._transform_socket: zmq.Socket | None = None
@@ -185,7 +194,8 @@ class net_sync_manager:
         # Threading
         self._running = False
         self._receive_thread: threading.Thread | None = None
-        self._lock = threading.RLock()
+        self._lock = threading.RLock()  # Lifecycle (start/stop/reconnect)
+        self._stats_lock = threading.Lock()  # Statistics counters only
 
         # Device/client identification
         self._device_id = str(uuid.uuid4())
@@ -208,6 +218,14 @@ class net_sync_manager:
         # Event queues and handlers
         self._rpc_queue: Queue = Queue(maxsize=queue_max)
         self._nv_queue: Queue = Queue(maxsize=queue_max)
+        self._queue_max = queue_max
+
+        # Coalesced NV events keyed by variable, used instead of _nv_queue when
+        # coalesce_nv_events is enabled. Keys: ("global", name) or
+        # ("client", client_no, name).
+        self._coalesce_nv_events = coalesce_nv_events
+        self._nv_pending: OrderedDict[tuple[Any, ...], tuple[Any, ...]] = OrderedDict()
+        self._nv_pending_lock = threading.Lock()
 
         # Event handlers
         self.on_rpc_received = EventHandler()
@@ -258,6 +276,11 @@ class net_sync_manager:
         }
 
     # Internal helpers
+    def _increment_stat(self, stat_name: str, amount: int = 1) -> None:
+        """Thread-safe increment of a statistics counter."""
+        with self._stats_lock:
+            self._stats[stat_name] += amount
+
     @staticmethod
     def _resolve_source_address(dest_host: str, dest_port: int) -> str | None:
         """Auto-detect the local IP that the OS would use to reach *dest_host*.
@@ -360,7 +383,7 @@ class net_sync_manager:
 
             try:
                 # Initialize ZeroMQ
-                self._context = zmq.Context()
+                self._context = self._shared_context or zmq.Context()
 
                 # DEALER socket for control uplink and control message receive
                 self._dealer_socket = self._context.socket(zmq.DEALER)
@@ -453,7 +476,8 @@ class net_sync_manager:
             self._sub_socket.close()
             self._sub_socket = None
         if self._context:
-            self._context.term()
+            if self._context is not self._shared_context:
+                self._context.term()
             self._context = None
 
     def _trigger_reconnect(self, error: str) -> None:
@@ -515,7 +539,7 @@ class net_sync_manager:
         # Recreate context if it was terminated
         if not self._context:
             try:
-                self._context = zmq.Context()
+                self._context = self._shared_context or zmq.Context()
             except Exception as e:
                 logger.error(f"Failed to create ZMQ context during reconnect: {e}")
                 return False
@@ -545,8 +569,7 @@ class net_sync_manager:
             self._sub_socket.connect(sub_addr)
             self._sub_socket.setsockopt(zmq.SUBSCRIBE, self._room.encode("utf-8"))
 
-            with self._lock:
-                self._stats["reconnect_count"] += 1
+            self._increment_stat("reconnect_count")
 
             logger.info(
                 f"Reconnected (#{self._stats['reconnect_count']}): "
@@ -706,10 +729,9 @@ class net_sync_manager:
                     if last_payload is not None:
                         # Track dropped frames for diagnostics
                         if frames_received > 1:
-                            with self._lock:
-                                self._stats["dropped_transform_frames"] += (
-                                    frames_received - 1
-                                )
+                            self._increment_stat(
+                                "dropped_transform_frames", frames_received - 1
+                            )
 
                         self._process_message(last_payload)
                         received_any = True
@@ -846,8 +868,7 @@ class net_sync_manager:
                 did_work = True
                 sent += 1
             elif outcome.is_backpressure:
-                with self._lock:
-                    self._stats["would_block_count"] += 1
+                self._increment_stat("would_block_count")
                 self._pending_control = packet
                 break
             else:
@@ -880,8 +901,7 @@ class net_sync_manager:
                 return True
             elif outcome.is_backpressure:
                 # Backpressure - keep the packet for retry
-                with self._lock:
-                    self._stats["would_block_count"] += 1
+                self._increment_stat("would_block_count")
                 return False
             else:
                 # Fatal error
@@ -917,8 +937,7 @@ class net_sync_manager:
             if msg_data is None:
                 return
 
-            with self._lock:
-                self._stats["messages_received"] += 1
+            self._increment_stat("messages_received")
 
             if msg_type == binary_serializer.MSG_ROOM_POSE:
                 self._process_room_transform(msg_data)
@@ -964,7 +983,7 @@ class net_sync_manager:
             for client_no in removed:
                 self.on_client_disconnected.invoke(client_no)
 
-            with self._lock:
+            with self._stats_lock:
                 self._stats["transforms_received"] += 1
                 self._stats["last_snapshot_time"] = time.monotonic()
 
@@ -976,10 +995,12 @@ class net_sync_manager:
         try:
             mappings = msg_data.get("mappings", [])
 
-            # Clear and rebuild mapping tables
-            self._device_to_client.clear()
-            self._client_to_device.clear()
-            self._client_stealth_flags.clear()
+            # Build fresh mapping tables and swap them in, so lock-free
+            # lookups (e.g. get_client_no from REST threads) never observe a
+            # half-rebuilt table.
+            device_to_client: dict[str, int] = {}
+            client_to_device: dict[int, str] = {}
+            client_stealth_flags: dict[int, bool] = {}
 
             for mapping in mappings:
                 device_id = mapping.get("deviceId")
@@ -987,9 +1008,9 @@ class net_sync_manager:
                 is_stealth = mapping.get("isStealthMode", False)
 
                 if device_id and client_no is not None:
-                    self._device_to_client[device_id] = client_no
-                    self._client_to_device[client_no] = device_id
-                    self._client_stealth_flags[client_no] = is_stealth
+                    device_to_client[device_id] = client_no
+                    client_to_device[client_no] = device_id
+                    client_stealth_flags[client_no] = is_stealth
 
                     # Check if this is our mapping
                     if device_id == self._device_id:
@@ -997,6 +1018,10 @@ class net_sync_manager:
                         self._is_ready = True
                         logger.info(f"Assigned client number: {client_no}")
 
+            self._device_to_client = device_to_client
+            self._client_to_device = client_to_device
+            self._client_stealth_flags = client_stealth_flags
+
         except Exception as e:
             logger.error(f"Error processing device mapping: {e}")
 
@@ -1012,8 +1037,7 @@ class net_sync_manager:
             except json.JSONDecodeError:
                 args = []
 
-            with self._lock:
-                self._stats["rpc_received"] += 1
+            self._increment_stat("rpc_received")
 
             # Queue for pull or auto-dispatch
             rpc_event = (sender_client_no, function_name, args)
@@ -1047,21 +1071,13 @@ class net_sync_manager:
                 self._global_variables[name] = value
 
                 if old_value != value:
-                    with self._lock:
-                        self._stats["nv_updates"] += 1
+                    self._increment_stat("nv_updates")
 
                     event = ("global", name, old_value, value)
                     if self._auto_dispatch:
                         self.on_global_variable_changed.invoke(name, old_value, value)
                     else:
-                        try:
-                            self._nv_queue.put_nowait(event)
-                        except Full:
-                            try:
-                                self._nv_queue.get_nowait()
-                                self._nv_queue.put_nowait(event)
-                            except Empty:
-                                pass
+                        self._queue_nv_event(event)
 
         except Exception as e:
             logger.error(f"Error processing global var sync: {e}")
@@ -1102,8 +1118,7 @@ class net_sync_manager:
                 self._client_variables[client_no] = new_vars
 
                 for event_client_no, name, old_value, new_value in changed_events:
-                    with self._lock:
-                        self._stats["nv_updates"] += 1
+                    self._increment_stat("nv_updates")
 
                     event: tuple[str, int, str, str | None, str | None] = (
                         "client",
@@ -1117,14 +1132,7 @@ class net_sync_manager:
                             event_client_no, name, old_value, new_value
                         )
                     else:
-                        try:
-                            self._nv_queue.put_nowait(event)
-                        except Full:
-                            try:
-                                self._nv_queue.get_nowait()
-                                self._nv_queue.put_nowait(event)
-                            except Empty:
-                                pass
+                        self._queue_nv_event(event)
 
         except Exception as e:
             logger.error(f"Error processing client var sync: {e}")
@@ -1290,6 +1298,35 @@ class net_sync_manager:
             logger.error(f"Error queueing client variable: {e}")
             return False
 
+    def set_client_variables(
+        self, target_client_no: int, variables: dict[str, str]
+    ) -> set[str]:
+        """Queue several client variable updates; return the names queued."""
+        queued: set[str] = set()
+        if not self._running or not self._dealer_socket or self._client_no is None:
+            return queued
+
+        var_data: dict[str, Any] = {
+            "senderClientNo": self._client_no,
+            "deviceId": self._device_id,
+            "targetClientNo": target_client_no,
+        }
+        for name, value in variables.items():
+            try:
+                var_data["variableName"] = name
+                var_data["variableValue"] = value
+                message = binary_serializer.serialize_client_var_set(var_data)
+            except Exception as e:
+                logger.error(f"Error queueing client variable: {e}")
+                continue
+            if not self._enqueue_control(
+                self._room, message, msg_type="client_variable"
+            ):
+                # Outbox is full; the remaining updates would be dropped too.
+                break
+            queued.add(name)
+        return queued
+
     def clear_my_client_variables(self) -> bool:
         """Queue a request to clear this client's variables on the server."""
         if not self._running or not self._dealer_socket or self._client_no is None:
@@ -1333,8 +1370,7 @@ class net_sync_manager:
             self._ctrl_outbox.put_nowait(packet)
             return True
         except Full:
-            with self._lock:
-                self._stats["ctrl_queue_drops"] += 1
+            self._increment_stat("ctrl_queue_drops")
             logger.warning(
                 "Control outbox full, dropping %s message (queue_drops=%s)",
                 msg_type,
@@ -1384,8 +1420,7 @@ class net_sync_manager:
         self._client_variables[client_no] = {}
 
         for name, old_value in old_vars.items():
-            with self._lock:
-                self._stats["nv_updates"] += 1
+            self._increment_stat("nv_updates")
 
             event: tuple[str, int, str, str | None, str | None] = (
                 "client",
@@ -1397,14 +1432,54 @@ class net_sync_manager:
             if self._auto_dispatch:
                 self.on_client_variable_changed.invoke(client_no, name, old_value, None)
             else:
+                self._queue_nv_event(event)
+
+    def _queue_nv_event(self, event: tuple[Any, ...]) -> None:
+        """Queue an NV change event for dispatch_pending_events().
+
+        With coalescing enabled, a pending event for the same variable is
+        replaced in place: the original old value is kept, the new value is
+        taken from the latest change, and the event moves to the back of the
+        queue. Otherwise the event is appended, dropping the oldest when full.
+        """
+        if not self._coalesce_nv_events:
+            try:
+                self._nv_queue.put_nowait(event)
+            except Full:
                 try:
+                    self._nv_queue.get_nowait()
                     self._nv_queue.put_nowait(event)
-                except Full:
-                    try:
-                        self._nv_queue.get_nowait()
-                        self._nv_queue.put_nowait(event)
-                    except Empty:
-                        pass
+                except Empty:
+                    pass
+            return
+
+        # Key excludes the trailing (old_value, new_value) pair
+        key = event[:-2]
+        with self._nv_pending_lock:
+            previous = self._nv_pending.pop(key, None)
+            if previous is not None:
+                old_value = previous[-2]
+                if old_value == event[-1]:
+                    # Net change since the last dispatch is a no-op
+                    return
+                event = (*key, old_value, event[-1])
+            self._nv_pending[key] = event
+            if len(self._nv_pending) > self._queue_max:
+                self._nv_pending.popitem(last=False)
+
+    def _pop_nv_event(self) -> tuple[Any, ...] | None:
+        """Return the oldest queued NV change event, or None when empty."""
+        if not self._coalesce_nv_events:
+            try:
+                event: tuple[Any, ...] = self._nv_queue.get_nowait()
+            except Empty:
+                return None
+            return event
+
+        with self._nv_pending_lock:
+            if not self._nv_pending:
+                return None
+            return self._nv_pending.popitem(last=False)[1]
 
     def is_client_stealth_mode(self, client_no: int) -> bool:
         """Check if the client is in stealth mode."""
@@ -1430,19 +1505,18 @@ class net_sync_manager:
 
         # Process Network Variable events
         while dispatched < max_items:
-            try:
-                event = self._nv_queue.get_nowait()
-                if event[0] == "global":
-                    _, name, old_value, new_value = event
-                    self.on_global_variable_changed.invoke(name, old_value, new_value)
-                elif event[0] == "client":
-                    _, client_no, name, old_value, new_value = event
-                    self.on_client_variable_changed.invoke(
-                        client_no, name, old_value, new_value
-                    )
-                dispatched += 1
-            except Empty:
+            nv_event = self._pop_nv_event()
+            if nv_event is None:
                 break
+            if nv_event[0] == "global":
+                _, name, old_value, new_value = nv_event
+                self.on_global_variable_changed.invoke(name, old_value, new_value)
+            elif nv_event[0] == "client":
+                _, client_no, name, old_value, new_value = nv_event
+                self.on_client_variable_changed.invoke(
+                    client_no, name, old_value, new_value
+                )
+            dispatched += 1
 
         return dispatched
 
@@ -1687,4 +1761,5 @@ class net_sync_manager:
     # Diagnostics
     def get_stats(self) -> dict[str, Any]:
         """Get diagnostic statistics."""
-        return self._stats.copy()
+        with self._stats_lock:
+            return self._stats.copy()
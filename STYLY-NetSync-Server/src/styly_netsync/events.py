@@ -2,42 +2,59 @@
 Simple event system for NetSync client callbacks.
 """
 
+import logging
+import threading
 from collections.abc import Callable
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
 
 class EventHandler:
-    """Simple event handler that manages callbacks."""
+    """Simple event handler that manages callbacks.
+
+    Callbacks are stored as an immutable tuple that is replaced on every
+    add/remove (copy-on-write), so ``invoke`` can iterate it without locking
+    or copying while listeners change on another thread.
+    """
+
+    __slots__ = ("_callbacks", "_lock")
 
     def __init__(self) -> None:
-        self._callbacks: list[Callable] = []
+        self._callbacks: tuple[Callable, ...] = ()
+        self._lock = threading.Lock()
 
     def add_listener(self, callback: Callable) -> Callable[[], None]:
         """Add a callback listener. Returns unsubscribe function."""
-        self._callbacks.append(callback)
+        with self._lock:
+            self._callbacks = self._callbacks + (callback,)
 
         def unsubscribe() -> None:
-            if callback in self._callbacks:
-                self._callbacks.remove(callback)
+            self.remove_listener(callback)
 
         return unsubscribe
 
     def remove_listener(self, callback: Callable) -> None:
         """Remove a callback listener."""
-        if callback in self._callbacks:
-            self._callbacks.remove(callback)
+        with self._lock:
+            callbacks = list(self._callbacks)
+            if callback in callbacks:
+                callbacks.remove(callback)
+                self._callbacks = tuple(callbacks)
 
     def invoke(self, *args: Any, **kwargs: Any) -> None:
         """Invoke all registered callbacks."""
-        for callback in self._callbacks[
-            :
-        ]:  # Copy to avoid modification during iteration
+        # The tuple is never mutated in place; listeners added or removed
+        # during iteration take effect from the next invoke.
+        for callback in self._callbacks:
             try:
                 callback(*args, **kwargs)
             except Exception:
-                # Continue with other callbacks even if one fails
-                pass
+                # Continue with other callbacks even if one fails. Formatting
+                # is deferred to the logging backend (enqueued under loguru).
+                logger.exception("Error in event listener %r", callback)
 
     def clear(self) -> None:
         """Remove all callbacks."""
-        self._callbacks.clear()
+        with self._lock:
+            self._callbacks = ()
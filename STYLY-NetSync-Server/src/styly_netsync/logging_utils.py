@@ -1,13 +1,17 @@
 # logging_utils.py
 from __future__ import annotations
 
+import heapq
 import json
 import logging
+import os
 import sys
 import threading
 from collections.abc import Callable, Iterator
 from datetime import UTC, datetime, time, timedelta
 from pathlib import Path
+from time import monotonic
+from types import FrameType
 from typing import Any
 
 from loguru import logger
@@ -19,8 +23,15 @@ from loguru._ctime_functions import get_ctime
 
 LOG_ROTATION_SIZE_BYTES = 10 * 1024 * 1024
 LOG_ROTATION_MAX_AGE = timedelta(days=7)
+# The default rotation condition only stat()s the log file once this fraction of
+# the size limit has been written since the last check, or after the interval.
+LOG_ROTATION_SIZE_CHECK_DIVISOR = 16
+LOG_ROTATION_SIZE_CHECK_INTERVAL = 5.0
 LOG_RETENTION_MAX_FILES = 20
 DEFAULT_LOG_FILENAME = "netsync-server.log"
+CONSOLE_LOG_FORMAT = (
+    "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | {message}"
+)
 LOG_LEVEL_SEVERITY = {
     "TRACE": 5,
     "DEBUG": 10,
@@ -40,50 +51,153 @@ RetentionRule = str | int | timedelta | Callable[[list[str]], None]
 
 
 class _RotationState:
+    """Rotation bookkeeping for a single file sink.
+
+    loguru invokes a sink's rotation condition under that handler's lock (or
+    from its single enqueue worker), so per-record updates come from one
+    writer at a time. ``_lock`` only guards multi-field updates against
+    ``reset()`` from configure_logging().
+    """
+
+    __slots__ = (
+        "_lock",
+        "_last",
+        "_rotate_at",
+        "_size_estimate",
+        "_unchecked_bytes",
+        "_size_checked_at",
+    )
+
     def __init__(self) -> None:
         self._lock = threading.Lock()
         self._last: float | None = None
-
+        # Age-rotation deadline (``_last`` + max age), derived once per file.
+        self._rotate_at: float | None = None
+        # Size tracking so the rotation condition can skip most stat() calls:
+        # last observed file size plus bytes handed to the sink since then.
+        self._size_estimate = 0
+        self._unchecked_bytes = 0
+        self._size_checked_at: float | None = None
+
+    # Readers below skip the lock: each reads single attributes, which is
+    # atomic under the GIL, and every writer holds ``_lock``.
     def get(self) -> float | None:
-        with self._lock:
-            return self._last
+        return self._last
 
     def set(self, value: float | None) -> None:
         with self._lock:
             self._last = value
+            self._rotate_at = None
 
     def reset(self) -> None:
-        self.set(None)
+        with self._lock:
+            self._last = None
+            self._rotate_at = None
+            self._size_estimate = 0
+            self._unchecked_bytes = 0
+            self._size_checked_at = None
+
+    def size_check_due(self, now: float) -> bool:
+        """Return True when the log file size should be re-read via stat()."""
+
+        checked_at = self._size_checked_at
+        if checked_at is None:
+            return True
+        return (
+            self._size_estimate >= LOG_ROTATION_SIZE_BYTES
+            or self._unchecked_bytes
+            >= LOG_ROTATION_SIZE_BYTES // LOG_ROTATION_SIZE_CHECK_DIVISOR
+            or now - checked_at >= LOG_ROTATION_SIZE_CHECK_INTERVAL
+        )
+
+    def observe_size(self, size: int, now: float) -> None:
+        """Record the file size returned by stat()."""
+
+        with self._lock:
+            self._size_estimate = size
+            self._unchecked_bytes = 0
+            self._size_checked_at = now
 
-    def get_or_set(self, factory: Callable[[], float]) -> float:
-        """Return cached value or compute/set once under lock."""
+    def mark_rotated(self, record_ts: float, now: float) -> None:
+        """Reset cached state for the fresh file started at ``record_ts``."""
 
         with self._lock:
-            if self._last is not None:
-                return self._last
+            self._last = record_ts
+            self._rotate_at = None
+            self._size_estimate = 0
+            self._unchecked_bytes = 0
+            self._size_checked_at = now
 
-            self._last = factory()
-            return self._last
+    def add_written(self, nbytes: int) -> None:
+        """Account for a record about to be written to the current file."""
+
+        # Hot path, once per record: serialised by the sink (see class doc).
+        self._size_estimate += nbytes
+        self._unchecked_bytes += nbytes
+
+    def get_rotate_at(self) -> float | None:
+        """Return the cached age-rotation deadline, if already derived."""
+
+        return self._rotate_at
+
+    def init_rotate_at(self, baseline: float) -> float:
+        """Derive the age-rotation deadline, keeping an already cached baseline."""
+
+        with self._lock:
+            # Re-check under the lock: another thread may have won the race
+            # after the unlocked get_rotate_at() miss.
+            if self._rotate_at is not None:
+                return self._rotate_at
+            if self._last is None:
+                self._last = baseline
+            self._rotate_at = self._last + LOG_ROTATION_MAX_AGE.total_seconds()
+            return self._rotate_at
 
 
 _rotation_state = _RotationState()
 
+# Stack depth from InterceptHandler.emit to the original caller, keyed by the
+# record's call site. The path through stdlib logging is fixed per call site,
+# so the frame walk only runs once per (pathname, lineno).
+_INTERCEPT_DEPTH_CACHE_MAX = 1024
+# Upper bound on frames walked through the stdlib logging package per miss.
+_INTERCEPT_MAX_FRAME_WALK = 16
+_LOGGING_FILE = logging.__file__
+# Loguru level (name, or the numeric level if loguru has no such name) for each
+# stdlib levelno seen so far.
+_intercept_level_cache: dict[int, str | int] = {}
+_intercept_depth_cache: dict[tuple[str, int], int] = {}
+
 
 class InterceptHandler(logging.Handler):
     """Redirect stdlib logging to loguru."""
 
     def emit(self, record: logging.LogRecord) -> None:
-        level: str | int
-        try:
-            level = logger.level(record.levelname).name
-        except (ValueError, TypeError):
-            level = record.levelno
-
-        frame = logging.currentframe()
-        depth = 2
-        while frame and frame.f_code.co_filename == logging.__file__:
-            frame = frame.f_back  # type: ignore[assignment]
-            depth += 1
+        level = _intercept_level_cache.get(record.levelno)
+        if level is None:
+            try:
+                level = logger.level(record.levelname).name
+            except (ValueError, TypeError):
+                level = record.levelno
+            _intercept_level_cache[record.levelno] = level
+
+        key = (record.pathname, record.lineno)
+        depth = _intercept_depth_cache.get(key)
+        if depth is None:
+            # Start at emit()'s caller and skip the stdlib logging frames so
+            # loguru attributes the record to the original call site.
+            frame: FrameType | None = sys._getframe(1)
+            depth = 1
+            while (
+                frame is not None
+                and depth < _INTERCEPT_MAX_FRAME_WALK
+                and frame.f_code.co_filename == _LOGGING_FILE
+            ):
+                frame = frame.f_back
+                depth += 1
+            if len(_intercept_depth_cache) >= _INTERCEPT_DEPTH_CACHE_MAX:
+                _intercept_depth_cache.clear()
+            _intercept_depth_cache[key] = depth
 
         logger.opt(depth=depth, exception=record.exc_info).log(
             level, record.getMessage()
@@ -103,50 +217,100 @@ def _resolve_log_path(file: Any) -> Path:
         return Path(str(name))
 
 
-def _get_rotation_start_time(file_path: Path, record_ts: float) -> float:
+def _log_file_size(file: Any, path: Path) -> int:
+    """Current size of the log file, preferring fstat() on the open handle."""
+
+    fileno = getattr(file, "fileno", None)
+    if fileno is not None:
+        try:
+            # fstat() on the sink's descriptor skips the path lookup that a
+            # stat() by name pays on every check.
+            return os.fstat(fileno()).st_size
+        except (OSError, ValueError):
+            pass
+    return path.stat().st_size
+
+
+def _get_rotation_deadline(
+    file_path: Path, record_ts: float, _state: _RotationState = _rotation_state
+) -> float:
     """
-    Baseline timestamp for age-based rotation.
+    Timestamp at which age-based rotation triggers (baseline + max age).
 
     Args:
         file_path: Path of the log file being evaluated.
         record_ts: Current log record timestamp used as a fallback.
+        _state: Shared rotation state, bound at definition time so the hot path
+            reads a local instead of a module global.
     """
 
-    def _compute_baseline() -> float:
-        start_time = None
+    rotate_at = _state.get_rotate_at()
+    if rotate_at is not None:
+        return rotate_at
+
+    start_time = None
+    if _state.get() is None:
         try:
             start_time = get_ctime(str(file_path))
         except (OSError, ValueError) as exc:
             logger.debug(f"get_ctime failed for {file_path}: {exc}")
-        return start_time or record_ts
+    return _state.init_rotate_at(start_time or record_ts)
 
-    return _rotation_state.get_or_set(_compute_baseline)
 
+def _default_rotation_condition(
+    message: Any, file: Any, _state: _RotationState = _rotation_state
+) -> bool:
+    """Rotate when file exceeds size or age thresholds.
 
-def _default_rotation_condition(message: Any, file: Any) -> bool:
-    """Rotate when file exceeds size or age thresholds."""
+    The file size is tracked from the records passed through this condition and
+    only re-read with stat() periodically (see ``LOG_ROTATION_SIZE_CHECK_*``),
+    instead of issuing one syscall per log record.
+    """
 
     record_ts = message.record["time"].timestamp()
+    message_size = len(message) if isinstance(message, str) else 0
+    now = monotonic()
 
     try:
         path = _resolve_log_path(file)
-        stat = path.stat()
+        if _state.size_check_due(now):
+            size = _log_file_size(file, path)
+            _state.observe_size(size, now)
+            if size >= LOG_ROTATION_SIZE_BYTES:
+                _state.mark_rotated(record_ts, now)
+                _state.add_written(message_size)
+                return True
     except (OSError, TypeError, ValueError) as exc:
         logger.debug(f"Rotation check skipped; stat failed: {exc}")
         return False
 
-    if stat.st_size >= LOG_ROTATION_SIZE_BYTES:
-        _rotation_state.set(record_ts)
-        return True
-
-    start_ts = _get_rotation_start_time(path, record_ts)
-    if record_ts - start_ts >= LOG_ROTATION_MAX_AGE.total_seconds():
-        _rotation_state.set(record_ts)
+    if record_ts >= _get_rotation_deadline(path, record_ts, _state):
+        _state.mark_rotated(record_ts, now)
+        _state.add_written(message_size)
         return True
 
+    _state.add_written(message_size)
     return False
 
 
+def _drop_page_cache(path: Any) -> None:
+    """Ask the kernel to evict a closed file's cached pages (POSIX only)."""
+
+    fadvise = getattr(os, "posix_fadvise", None)
+    if fadvise is None:
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except (OSError, TypeError, ValueError):
+        return
+    try:
+        fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 def _default_retention_policy(logs: list[Any]) -> None:
     """
     Keep the newest log files and drop older ones.
@@ -155,16 +319,48 @@ def _default_retention_policy(logs: list[Any]) -> None:
         logs: Paths (string or Path) of log files to consider.
     """
 
-    valid_logs: list[tuple[float, Any]] = []
+    # loguru calls this once per rotation, with every rotated file closed.
+    # Nothing reads them back, so their pages should not keep occupying the
+    # page cache. Unlinked files release their pages anyway.
+    for path in logs:
+        _drop_page_cache(path)
+
+    # Nothing can be over the limit if even the candidate list is not.
+    if len(logs) <= LOG_RETENTION_MAX_FILES:
+        return
+
+    names_by_parent: dict[Path, set[str]] = {}
     for path in logs:
         try:
             p = Path(path)
-            valid_logs.append((p.stat().st_mtime, p))
-        except (OSError, TypeError, ValueError):
+        except (TypeError, ValueError):
+            continue
+        names_by_parent.setdefault(p.parent, set()).add(p.name)
+
+    # One directory scan per parent instead of building and stat()ing a Path
+    # per file; DirEntry caches its stat result (free on Windows).
+    valid_logs: list[tuple[float, Any]] = []
+    for parent, names in names_by_parent.items():
+        try:
+            with os.scandir(parent) as it:
+                for entry in it:
+                    if entry.name not in names:
+                        continue
+                    try:
+                        valid_logs.append((entry.stat().st_mtime, Path(entry.path)))
+                    except OSError:
+                        continue
+        except OSError:
             continue
 
-    valid_logs.sort(key=lambda item: item[0], reverse=True)
-    for _, path in valid_logs[LOG_RETENTION_MAX_FILES:]:
+    excess = len(valid_logs) - LOG_RETENTION_MAX_FILES
+    if excess <= 0:
+        return
+
+    # Only the oldest `excess` files are needed, so select them with a heap
+    # instead of sorting every rotated file.
+    victims = heapq.nsmallest(excess, valid_logs, key=lambda item: item[0])
+    for _, path in victims:
         try:
             path.unlink()
         except OSError as exc:
@@ -200,9 +396,7 @@ def configure_logging(
         "diagnose": False,
     }
     if not console_json:
-        console_kwargs["format"] = (
-            "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | {message}"
-        )
+        console_kwargs["format"] = CONSOLE_LOG_FORMAT
 
     logger.add(sys.stderr, **console_kwargs)
 
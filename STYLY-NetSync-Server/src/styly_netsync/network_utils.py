@@ -1,12 +1,48 @@
 """Network utility functions for STYLY NetSync."""
 
 import logging
+import re
 import socket
+import threading
+import time
 
 import psutil
 
 logger = logging.getLogger(__name__)
 
+# Patterns to exclude virtual/bridge interfaces
+# These are common virtual interface prefixes across different platforms
+_VIRTUAL_IFACE_PREFIXES = (
+    "bridge",  # VMware, Parallels bridges
+    "docker",  # Docker interfaces
+    "veth",  # Virtual Ethernet (Docker, LXC)
+    "vmnet",  # VMware network
+    "vboxnet",  # VirtualBox network
+    "virbr",  # libvirt bridge
+    "tun",  # VPN tunnels
+    "tap",  # Virtual network tap
+    "utun",  # macOS VPN tunnels
+    "vnic",  # Virtual NIC
+    "ppp",  # Point-to-Point Protocol (VPN)
+)
+# One case-insensitive match per interface instead of lower() + startswith()
+_VIRTUAL_IFACE_RE = re.compile(
+    "|".join(re.escape(prefix) for prefix in _VIRTUAL_IFACE_PREFIXES), re.IGNORECASE
+)
+
+# Interface enumeration is comparatively expensive and the address set rarely
+# changes on a running host, so results are reused for a few seconds.
+IP_CACHE_TTL = 5.0
+_ip_cache: tuple[float, list[str]] | None = None
+_ip_cache_lock = threading.Lock()
+
+
+def invalidate_ip_cache() -> None:
+    """Drop the cached result of :func:`get_local_ip_addresses`."""
+    global _ip_cache
+    with _ip_cache_lock:
+        _ip_cache = None
+
 
 def get_local_ip_addresses() -> list[str]:
     """
@@ -14,6 +50,7 @@ def get_local_ip_addresses() -> list[str]:
 
     Filters out virtual interfaces (bridges, VPNs, Docker, etc.) and APIPA addresses
     (169.254.x.x) to show only IP addresses that are likely accessible from external devices.
+    Results are cached for ``IP_CACHE_TTL`` seconds; see :func:`invalidate_ip_cache`.
 
     Returns:
         list: List of IP addresses as strings
@@ -23,28 +60,32 @@ def get_local_ip_addresses() -> list[str]:
         >>> print(ips)
         ['192.168.1.100', '10.0.0.50']
     """
+    global _ip_cache
+    now = time.monotonic()
+    with _ip_cache_lock:
+        cached = _ip_cache
+        if cached is not None and now - cached[0] < IP_CACHE_TTL:
+            return list(cached[1])
+
+        ip_addresses, ok = _scan_local_ip_addresses()
+        if ok:
+            _ip_cache = (now, ip_addresses)
+            return list(ip_addresses)
+    return ip_addresses
+
+
+def _scan_local_ip_addresses() -> tuple[list[str], bool]:
+    """Enumerate interface addresses.
+
+    Returns the addresses collected so far and whether enumeration completed;
+    a partial result is still usable but must not be cached.
+    """
     ip_addresses = []
     try:
-        # Patterns to exclude virtual/bridge interfaces
-        # These are common virtual interface prefixes across different platforms
-        virtual_prefixes = (
-            "bridge",  # VMware, Parallels bridges
-            "docker",  # Docker interfaces
-            "veth",  # Virtual Ethernet (Docker, LXC)
-            "vmnet",  # VMware network
-            "vboxnet",  # VirtualBox network
-            "virbr",  # libvirt bridge
-            "tun",  # VPN tunnels
-            "tap",  # Virtual network tap
-            "utun",  # macOS VPN tunnels
-            "vnic",  # Virtual NIC
-            "ppp",  # Point-to-Point Protocol (VPN)
-        )
-
         # Get all network interfaces
         for interface_name, interface_addresses in psutil.net_if_addrs().items():
             # Skip virtual interfaces
-            if interface_name.lower().startswith(virtual_prefixes):
+            if _VIRTUAL_IFACE_RE.match(interface_name):
                 continue
 
             for address in interface_addresses:
@@ -56,5 +97,6 @@ def get_local_ip_addresses() -> list[str]:
                         ip_addresses.append(ip)
     except Exception as e:
         logger.warning(f"Failed to get local IP addresses: {e}")
+        return ip_addresses, False
 
-    return ip_addresses
+    return ip_addresses, True
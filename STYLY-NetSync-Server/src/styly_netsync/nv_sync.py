@@ -25,9 +25,10 @@ structures.
 from __future__ import annotations
 
 import struct
+import threading
 import time
 import zlib
-from collections import deque
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 from typing import Any, Literal
 
@@ -55,6 +56,36 @@ NAME_TABLE_DELTA_MESSAGE_TYPE = 0x31
 NAME_TABLE_DIGEST_MESSAGE_TYPE = 0x32
 
 
+# Digest entries are the little-endian u16 ``nameId`` followed by the UTF-8 name.
+_pack_name_id = struct.Struct("<H").pack
+
+# Packers are reused per thread; creating one per payload costs an allocation
+# and buffer setup on every delta flush.
+_packer_local = threading.local()
+
+
+def _get_packer() -> msgpack.Packer:
+    packer: msgpack.Packer | None = getattr(_packer_local, "packer", None)
+    if packer is None:
+        packer = msgpack.Packer(use_bin_type=True)
+        _packer_local.packer = packer
+    return packer
+
+
+def _get_stream_packer() -> msgpack.Packer:
+    """Per-thread packer for incremental writes; callers must ``reset()`` it.
+
+    ``reset()`` only rewinds the internal buffer, so its allocation is kept
+    across flushes.
+    """
+
+    packer: msgpack.Packer | None = getattr(_packer_local, "stream_packer", None)
+    if packer is None:
+        packer = msgpack.Packer(use_bin_type=True, autoreset=False)
+        _packer_local.stream_packer = packer
+    return packer
+
+
 ScopeLiteral = Literal["g", "c"]
 OperationLiteral = Literal["set", "del"]
 
@@ -99,6 +130,10 @@ class NameTable:
         "count",
         "crc32",
         "_last_used",
+        "_entries_cache",
+        "_entries_payload_cache",
+        "_name_bytes",
+        "_name_bytes_total",
     )
 
     def __init__(self, *, start_name_id: int = 1) -> None:
@@ -110,7 +145,16 @@ class NameTable:
         self.version: int = 0
         self.count: int = 0
         self.crc32: int = 0
-        self._last_used: dict[int, float] = {}
+        # Kept in least-recently-used order so trim_stale() can stop at the
+        # first entry that is still fresh.
+        self._last_used: OrderedDict[int, float] = OrderedDict()
+        # Entries in ``nameId`` order; rebuilt lazily after the table changes.
+        self._entries_cache: tuple[tuple[int, str], ...] | None = None
+        # ``[[nameId, name], ...]`` as embedded in full/snapshot payloads.
+        self._entries_payload_cache: list[list[int | str]] | None = None
+        # UTF-8 length per name so the table size is known without re-encoding.
+        self._name_bytes: dict[int, int] = {}
+        self._name_bytes_total = 0
 
     # ------------------------------------------------------------------
     # Lookup helpers
@@ -133,6 +177,8 @@ class NameTable:
 
         self._name_to_id[name] = name_id
         self._id_to_name[name_id] = name
+        self._entries_cache = None
+        self._entries_payload_cache = None
         self.count = len(self._id_to_name)
 
         if self._delta_base_version is None:
@@ -140,14 +186,21 @@ class NameTable:
         self.version += 1
 
         self._pending_added.append((name_id, name))
-        self._recompute_crc32()
+        encoded = name.encode("utf-8")
+        self._name_bytes[name_id] = len(encoded)
+        self._name_bytes_total += len(encoded)
+        # New ids always sort last, so the digest can be extended in place
+        # instead of re-hashing the whole table.
+        self.crc32 = zlib.crc32(encoded, zlib.crc32(_pack_name_id(name_id), self.crc32))
         self.touch(name_id)
         return name_id, True
 
     def touch(self, name_id: int) -> None:
         """Mark ``name_id`` as recently used (for GC heuristics)."""
 
-        self._last_used[name_id] = time.monotonic()
+        last_used = self._last_used
+        last_used[name_id] = time.monotonic()
+        last_used.move_to_end(name_id)
 
     # ------------------------------------------------------------------
     # Payload generation helpers
@@ -155,7 +208,29 @@ class NameTable:
     def entries(self) -> list[tuple[int, str]]:
         """Return all table entries sorted by ``nameId``."""
 
-        return sorted(self._id_to_name.items())
+        return list(self._sorted_entries())
+
+    def _sorted_entries(self) -> tuple[tuple[int, str], ...]:
+        entries = self._entries_cache
+        if entries is None:
+            # ``nameId`` values are allocated monotonically and only ever
+            # appended, so dict insertion order is already sorted.
+            entries = tuple(self._id_to_name.items())
+            self._entries_cache = entries
+        return entries
+
+    def entries_payload(self) -> list[list[int | str]]:
+        """Return the ``[[nameId, name], ...]`` list used in outgoing payloads.
+
+        The list is cached until the table changes and shared between
+        payloads, so callers must treat it as read-only.
+        """
+
+        payload = self._entries_payload_cache
+        if payload is None:
+            payload = [[name_id, name] for name_id, name in self._sorted_entries()]
+            self._entries_payload_cache = payload
+        return payload
 
     def build_full_payload(self, room_id: str) -> dict[str, Any]:
         """Build a ``NAME_TABLE_FULL`` payload."""
@@ -164,7 +239,7 @@ class NameTable:
             "type": NAME_TABLE_FULL_MESSAGE_TYPE,
             "roomId": room_id,
             "version": self.version,
-            "entries": [[name_id, name] for name_id, name in self.entries()],
+            "entries": self.entries_payload(),
         }
 
     def build_digest_payload(self, room_id: str) -> dict[str, Any]:
@@ -204,6 +279,11 @@ class NameTable:
     # ------------------------------------------------------------------
     # Maintenance helpers
     # ------------------------------------------------------------------
+    def approx_bytes(self) -> int:
+        """Approximate encoded size of the table entries (ids plus names)."""
+
+        return self._name_bytes_total + 2 * self.count
+
     def digest_tuple(self) -> tuple[int, int, int]:
         """Return ``(version, count, crc32)`` for snapshot embedding."""
 
@@ -221,31 +301,46 @@ class NameTable:
 
         cutoff = time.monotonic() - stale_after
         removed: list[int] = []
-        for name_id, last_used in list(self._last_used.items()):
-            if last_used < cutoff:
-                removed.append(name_id)
+        for name_id, last_used in self._last_used.items():
+            if last_used >= cutoff:
+                break
+            removed.append(name_id)
 
         for name_id in removed:
             self._last_used.pop(name_id, None)
+            self._name_bytes_total -= self._name_bytes.pop(name_id, 0)
             name = self._id_to_name.pop(name_id, None)
             if name is None:
                 continue
             self._name_to_id.pop(name, None)
 
         if removed:
+            self._entries_cache = None
+            self._entries_payload_cache = None
             self.count = len(self._id_to_name)
             self._recompute_crc32()
 
         return removed
 
     def _recompute_crc32(self) -> None:
-        payload = bytearray()
-        for name_id, name in self.entries():
-            payload.extend(struct.pack("<H", name_id))
-            payload.extend(name.encode("utf-8"))
+        entries = self._sorted_entries()
+        chunks: list[bytes] = [b""] * (2 * len(entries))
+        chunks[0::2] = [_pack_name_id(name_id) for name_id, _ in entries]
+        chunks[1::2] = [name.encode("utf-8") for _, name in entries]
+        payload = b"".join(chunks)
         self.crc32 = zlib.crc32(payload) & 0xFFFFFFFF
 
 
+def _approx_value_size(value: Any) -> int:
+    """Rough MessagePack size of an NV value, without encoding it."""
+
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value) + 1
+    if isinstance(value, (list, tuple, dict)):
+        return 1 + 8 * len(value)
+    return 9
+
+
 class RoomState:
     """Mutable NV state for a single room."""
 
@@ -268,6 +363,8 @@ class RoomState:
         self.globals_by_id: dict[int, Any] = {}
         self.clients_by_no: dict[int, dict[int, Any]] = {}
         self.name_table = NameTable()
+        # Running estimate of the encoded size of all stored values.
+        self._approx_value_bytes = 0
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -282,15 +379,22 @@ class RoomState:
         stored = len(self.delta_log)
         self._delta_floor = self.nv_seq - stored + 1
 
-    def _ensure_client_scope(self, client_no: int) -> dict[int, Any]:
-        return self.clients_by_no.setdefault(client_no, {})
+    def _store_value(self, scope: dict[int, Any], name_id: int, value: Any) -> None:
+        if name_id in scope:
+            self._approx_value_bytes -= 2 + _approx_value_size(scope[name_id])
+        scope[name_id] = value
+        self._approx_value_bytes += 2 + _approx_value_size(value)
+
+    def _drop_value(self, scope: dict[int, Any], name_id: int) -> None:
+        if name_id in scope:
+            self._approx_value_bytes -= 2 + _approx_value_size(scope.pop(name_id))
 
     # ------------------------------------------------------------------
     # Public mutation API
     # ------------------------------------------------------------------
     def set_global(self, name: str, value: Any) -> DeltaRecord:
         name_id, _ = self.name_table.resolve(name)
-        self.globals_by_id[name_id] = value
+        self._store_value(self.globals_by_id, name_id, value)
         seq = self._next_seq()
         record = DeltaRecord(
             seq=seq,
@@ -307,7 +411,7 @@ class RoomState:
         if name_id is None:
             return None
 
-        self.globals_by_id.pop(name_id, None)
+        self._drop_value(self.globals_by_id, name_id)
         self.name_table.touch(name_id)
         seq = self._next_seq()
         record = DeltaRecord(
@@ -322,8 +426,11 @@ class RoomState:
 
     def set_client(self, client_no: int, name: str, value: Any) -> DeltaRecord:
         name_id, _ = self.name_table.resolve(name)
-        scope = self._ensure_client_scope(client_no)
-        scope[name_id] = value
+        scope = self.clients_by_no.get(client_no)
+        if scope is None:
+            scope = {}
+            self.clients_by_no[client_no] = scope
+        self._store_value(scope, name_id, value)
         seq = self._next_seq()
         record = DeltaRecord(
             seq=seq,
@@ -341,11 +448,13 @@ class RoomState:
         if name_id is None:
             return None
 
-        scope = self._ensure_client_scope(client_no)
-        if name_id not in scope:
+        # Look up only: deleting from an unknown client must not create an
+        # empty scope that would then show up in snapshots.
+        scope = self.clients_by_no.get(client_no)
+        if scope is None or name_id not in scope:
             return None
 
-        scope.pop(name_id, None)
+        self._drop_value(scope, name_id)
         self.name_table.touch(name_id)
         seq = self._next_seq()
         record = DeltaRecord(
@@ -362,12 +471,27 @@ class RoomState:
     # ------------------------------------------------------------------
     # Snapshot & delta generation
     # ------------------------------------------------------------------
+    def approx_snapshot_bytes(self) -> int:
+        """Cheap estimate of the encoded snapshot size, maintained on mutation.
+
+        Lets callers choose between a snapshot and a delta resend without
+        walking the room state.
+        """
+
+        return self._approx_value_bytes + self.name_table.approx_bytes()
+
     def build_snapshot_payload(self) -> dict[str, Any]:
+        """Build a ``SNAPSHOT`` payload.
+
+        ``globals`` and ``clients`` reference the live room state rather than
+        copies, so the payload must be encoded before the room is mutated again.
+        """
+
         version, count, crc32 = self.name_table.digest_tuple()
-        globals_payload = dict(self.globals_by_id)
-        clients_payload = {
-            client_no: dict(scope) for client_no, scope in self.clients_by_no.items()
-        }
+        # Integer-keyed dicts are handed to msgpack whole: its C packer walks
+        # them faster than streaming keys through per-item pack() calls.
+        globals_payload = self.globals_by_id
+        clients_payload = self.clients_by_no
         return {
             "type": SNAPSHOT_MESSAGE_TYPE,
             "roomId": self.room_id,
@@ -376,9 +500,7 @@ class RoomState:
             "clients": clients_payload,
             "nameTable": {
                 "version": version,
-                "entries": [
-                    [name_id, name] for name_id, name in self.name_table.entries()
-                ],
+                "entries": self.name_table.entries_payload(),
                 "count": count,
                 "crc32": crc32,
             },
@@ -398,6 +520,60 @@ class RoomState:
             "items": items,
         }
 
+    def encode_delta_payload(self) -> bytes | None:
+        """Collect pending deltas and encode them straight to MessagePack.
+
+        Produces the same bytes as ``encode_payload(collect_delta_payload())``
+        but streams each record into the packer instead of building an
+        intermediate dict per record.
+        """
+
+        pending = self.pending_deltas
+        if not pending:
+            return None
+
+        base_seq = pending[0].seq - 1
+        self.pending_deltas = []
+
+        packer = _get_stream_packer()
+        try:
+            return self._stream_delta_payload(packer, pending, base_seq)
+        finally:
+            packer.reset()
+
+    def _stream_delta_payload(
+        self, packer: msgpack.Packer, pending: list[DeltaRecord], base_seq: int
+    ) -> bytes:
+        pack = packer.pack
+        packer.pack_map_header(4)
+        pack("type")
+        pack(DELTA_MESSAGE_TYPE)
+        pack("roomId")
+        pack(self.room_id)
+        pack("baseSeq")
+        pack(base_seq)
+        pack("items")
+        packer.pack_array_header(len(pending))
+        for record in pending:
+            is_client = record.scope == "c"
+            is_set = record.op == "set"
+            packer.pack_map_header(4 + is_client + is_set)
+            pack("seq")
+            pack(record.seq)
+            pack("scope")
+            pack(record.scope)
+            pack("op")
+            pack(record.op)
+            pack("nameId")
+            pack(record.name_id)
+            if is_client:
+                pack("clientNo")
+                pack(record.client_no or 0)
+            if is_set:
+                pack("value")
+                pack(record.value)
+        return bytes(packer.bytes())
+
     def collect_name_table_delta(self) -> dict[str, Any] | None:
         return self.name_table.collect_delta_payload(self.room_id)
 
@@ -427,4 +603,4 @@ class RoomState:
     def encode_payload(payload: dict[str, Any]) -> bytes:
         """Encode a payload dictionary using MessagePack."""
 
-        return bytes(msgpack.dumps(payload, use_bin_type=True))
+        return bytes(_get_packer().pack(payload))
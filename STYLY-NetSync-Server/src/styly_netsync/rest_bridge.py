@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
+import os
 import socket
 import threading
 import time
 from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Annotated, Protocol
+from typing import TYPE_CHECKING, Annotated, Any, Protocol
 
+import zmq
+from anyio import to_thread
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, StringConstraints
@@ -29,6 +35,15 @@ logger = logging.getLogger(__name__)
 MAX_NAME = 64
 MAX_VALUE = 1024
 MAX_GLOBAL_VARS = 100
+# Lock stripes for GlobalVarStore; must be a power of two.
+GLOBAL_STORE_LOCK_STRIPES = 16
+
+# RoomBridge tick timing (seconds). Once connected, a bridge is not ticked again
+# until woken by newly queued variables, with BRIDGE_IDLE_WAIT as a safety net.
+BRIDGE_HANDSHAKE_INTERVAL = 0.5
+BRIDGE_POLL_INTERVAL = 0.1
+BRIDGE_IDLE_WAIT = 1.0
+_NS_PER_SECOND = 1_000_000_000
 
 # Constrained string types for variable names and values
 VarName = Annotated[str, StringConstraints(min_length=1, max_length=MAX_NAME)]
@@ -41,6 +56,18 @@ class UpsertBody(BaseModel):
     variables: dict[VarName, VarValue] = Field(default_factory=dict)
 
 
+class GlobalUpsertBody(UpsertBody):
+    """Request body for global variable upsert.
+
+    A single request can never fit more than ``MAX_GLOBAL_VARS`` names, so the
+    count is capped while parsing instead of after taking the store lock.
+    """
+
+    variables: dict[VarName, VarValue] = Field(
+        default_factory=dict, max_length=MAX_GLOBAL_VARS
+    )
+
+
 class ClientVariableServer(Protocol):
     """Server-side operations used by REST client-variable endpoints."""
 
@@ -68,11 +95,16 @@ class GlobalVarStore:
 
     def __init__(self) -> None:
         self._data: dict[str, dict[str, str]] = {}
-        self._lock = threading.RLock()
+        # Every operation touches a single room, so rooms are spread over a
+        # fixed set of locks instead of serialising all rooms on one.
+        self._locks = tuple(threading.Lock() for _ in range(GLOBAL_STORE_LOCK_STRIPES))
+
+    def _lock_for(self, room_id: str) -> threading.Lock:
+        return self._locks[hash(room_id) & (GLOBAL_STORE_LOCK_STRIPES - 1)]
 
-    def upsert(self, room_id: str, kvs: dict[str, str]) -> dict[str, str]:
+    def upsert(self, room_id: str, kvs: dict[str, str]) -> None:
         """Merge incoming key-values for a room."""
-        with self._lock:
+        with self._lock_for(room_id):
             current = self._data.get(room_id, {})
             new_keys = [name for name in kvs if name not in current]
             if len(current) + len(new_keys) > MAX_GLOBAL_VARS:
@@ -81,22 +113,95 @@ class GlobalVarStore:
                 )
             current.update(kvs)
             self._data[room_id] = current
-            return dict(current)
 
     def get(self, room_id: str) -> dict[str, str]:
         """Return a copy of stored global variables for a room."""
-        with self._lock:
+        with self._lock_for(room_id):
             return dict(self._data.get(room_id, {}))
 
+    def has_pending(self, room_id: str) -> bool:
+        """Return whether a room has queued variables, without locking.
+
+        A single dict read is atomic under the GIL; a stale answer only delays
+        the flush to the next bridge tick.
+        """
+        return bool(self._data.get(room_id))
+
     def pop(self, room_id: str) -> dict[str, str]:
         """Atomically retrieve and remove stored global variables for a room."""
-        with self._lock:
+        with self._lock_for(room_id):
             return self._data.pop(room_id, {})
 
 
 global_store = GlobalVarStore()
 
 
+class _BridgeScheduler:
+    """Single worker thread that ticks every RoomBridge when it is due.
+
+    Each bridge has at most one live heap entry. Scheduling never pushes a
+    later deadline than the live one, so a wake() that lands while the bridge
+    is being ticked is not overridden by the tick's own reschedule.
+    """
+
+    def __init__(self) -> None:
+        # Deadlines are integer time.monotonic_ns() values.
+        self._heap: list[tuple[int, int, RoomBridge]] = []
+        self._cond = threading.Condition(threading.Lock())
+        self._seq = itertools.count()
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, bridge: RoomBridge, delay: float = 0.0) -> None:
+        """Run ``bridge._tick()`` after ``delay`` seconds, unless sooner already."""
+        deadline = time.monotonic_ns() + int(delay * _NS_PER_SECOND)
+        with self._cond:
+            if bridge._due_at is not None and bridge._due_at <= deadline:
+                return
+            seq = next(self._seq)
+            bridge._due_at = deadline
+            bridge._due_seq = seq
+            heapq.heappush(self._heap, (deadline, seq, bridge))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="netsync-bridge-scheduler", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _next_due(self) -> RoomBridge:
+        with self._cond:
+            while True:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                deadline, seq, bridge = self._heap[0]
+                wait_ns = deadline - time.monotonic_ns()
+                if wait_ns > 0:
+                    self._cond.wait(wait_ns / _NS_PER_SECOND)
+                    continue
+                heapq.heappop(self._heap)
+                # Entries superseded by an earlier reschedule are dropped.
+                if bridge._due_seq == seq:
+                    bridge._due_at = None
+                    return bridge
+
+    def _run(self) -> None:
+        while True:
+            bridge = self._next_due()
+            if not bridge._running:
+                continue
+            try:
+                delay = bridge._tick()
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.debug("Bridge tick error (room=%s): %s", bridge.room_id, exc)
+                delay = BRIDGE_HANDSHAKE_INTERVAL
+            if bridge._running:
+                self.schedule(bridge, delay)
+
+
+_scheduler = _BridgeScheduler()
+
+
 class RoomBridge:
     """Internal client per room responsible for flushing queued variables."""
 
@@ -107,6 +212,8 @@ class RoomBridge:
         transform_port: int,
         sub_port: int | str | None = None,
         room_id: str | None = None,
+        *,
+        context: zmq.Context | None = None,
     ) -> None:
         if room_id is None:
             if isinstance(sub_port, str):
@@ -130,10 +237,13 @@ class RoomBridge:
             transform_port=transform_port,
             sub_port=sub_port,
             room=room_id,
+            context=context,
         )
         self._running = False
-        self._thread = threading.Thread(target=self._loop, daemon=True)
-        self._apply_lock = threading.RLock()
+        self._next_handshake_at = 0  # time.monotonic_ns()
+        # Owned by _scheduler and only touched under its lock.
+        self._due_at: int | None = None
+        self._due_seq = -1
 
     @property
     def manager(self) -> net_sync_manager:
@@ -141,56 +251,61 @@ class RoomBridge:
         return self._manager
 
     def start(self) -> None:
-        """Start the internal client and background loop."""
+        """Start the internal client and schedule its background ticks."""
         if self._running:
             return
         self._manager.start()
         self._running = True
-        self._thread.start()
+        _scheduler.schedule(self)
 
     def stop(self) -> None:
-        """Stop the background loop and client."""
+        """Stop background ticks and the client."""
         self._running = False
         try:
             self._manager.stop()
         except Exception as exc:  # pragma: no cover - defensive
             logger.debug("Failed to stop room bridge manager cleanly: %s", exc)
 
-    def _loop(self) -> None:
-        """Drive stealth handshakes and flush queued variables."""
-        next_handshake_at = 0.0
-        while self._running:
-            try:
-                now = time.monotonic()
-                if not self._manager.client_no or self._manager.client_no == 0:
-                    if now >= next_handshake_at:
-                        try:
-                            self._manager.send_stealth_handshake()
-                        except Exception as exc:
-                            logger.debug("Stealth handshake failed: %s", exc)
-                        next_handshake_at = now + 0.5
-                else:
-                    try:
-                        self.flush_global_vars()
-                    except Exception as exc:
-                        logger.debug("Flush failed: %s", exc)
-                time.sleep(0.1)
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.debug("Bridge loop error: %s", exc)
-                time.sleep(0.5)
+    def wake(self) -> None:
+        """Tick the bridge as soon as possible, e.g. after variables were queued."""
+        if self._running:
+            _scheduler.schedule(self)
+
+    def _tick(self) -> float:
+        """Drive stealth handshakes and flush queued variables.
+
+        Runs on the shared scheduler thread and returns the delay in seconds
+        until the next tick.
+        """
+        if not self._manager.client_no:
+            now = time.monotonic_ns()
+            if now >= self._next_handshake_at:
+                try:
+                    self._manager.send_stealth_handshake()
+                except Exception as exc:
+                    logger.debug("Stealth handshake failed: %s", exc)
+                self._next_handshake_at = now + int(
+                    BRIDGE_HANDSHAKE_INTERVAL * _NS_PER_SECOND
+                )
+            # The manager exposes no "client number assigned" event, so poll
+            # for the handshake reply.
+            return BRIDGE_POLL_INTERVAL
+        try:
+            self.flush_global_vars()
+        except Exception as exc:
+            logger.debug("Flush failed: %s", exc)
+        if global_store.has_pending(self.room_id):
+            # Retry variables that failed to apply.
+            return BRIDGE_POLL_INTERVAL
+        return BRIDGE_IDLE_WAIT
 
     def apply_now_or_queue(self, device_id: str, kvs: dict[str, str]) -> dict[str, str]:
         """Attempt to apply variables immediately, otherwise mark them queued."""
-        statuses: dict[str, str] = {}
         client_no = self.get_client_no(device_id)
-        if client_no:
-            applied = self._apply_to_client(client_no, kvs)
-            for name in kvs:
-                statuses[name] = "applied" if name in applied else "failed"
-        else:
-            for name in kvs:
-                statuses[name] = "queued"
-        return statuses
+        if not client_no:
+            return dict.fromkeys(kvs, "queued")
+        applied = self._apply_to_client(client_no, kvs)
+        return {name: "applied" if name in applied else "failed" for name in kvs}
 
     def get_client_no(self, device_id: str) -> int | None:
         """Return client number for device if mapping is known."""
@@ -208,6 +323,14 @@ class RoomBridge:
             logger.debug("get_all_global_variables failed: %s", exc)
             return {}
 
+    def get_global_variable(self, name: str) -> str | None:
+        """Return one cached global variable without copying the whole cache."""
+        try:
+            return self._manager.get_global_variable(name)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug("get_global_variable failed: %s", exc)
+            return None
+
     def get_client_variables(self, device_id: str) -> tuple[int | None, dict[str, str]]:
         """Return (client_no, snapshot) for device; client_no is None if unmapped."""
         client_no = self.get_client_no(device_id)
@@ -220,62 +343,55 @@ class RoomBridge:
             return client_no, {}
 
     def _apply_to_client(self, client_no: int, kvs: dict[str, str]) -> set[str]:
-        """Apply stored variables to the target client via set_client_variable."""
-        applied: set[str] = set()
+        """Apply stored variables to the target client via set_client_variables."""
         if not self._manager.client_no:
-            return applied
-        with self._apply_lock:
-            for name, value in kvs.items():
-                ok = False
-                try:
-                    ok = self._manager.set_client_variable(client_no, name, value)
-                except Exception as exc:  # pragma: no cover - defensive
-                    logger.debug(
-                        "set_client_variable failed (room=%s, device=%s, key=%s): %s",
-                        self.room_id,
-                        client_no,
-                        name,
-                        exc,
-                    )
-                if ok:
-                    applied.add(name)
-        return applied
+            return set()
+        # No bridge-side lock: the manager only enqueues onto its thread-safe
+        # control outbox, and its sender thread owns the DEALER socket.
+        try:
+            return self._manager.set_client_variables(client_no, kvs)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug(
+                "set_client_variables failed (room=%s, device=%s): %s",
+                self.room_id,
+                client_no,
+                exc,
+            )
+            return set()
 
     def apply_global_now_or_queue(self, kvs: dict[str, str]) -> dict[str, str]:
         """Attempt to apply global variables immediately, otherwise mark them queued."""
-        statuses: dict[str, str] = {}
-        if self._manager.client_no:
-            applied = self._apply_global(kvs)
-            for name in kvs:
-                statuses[name] = "applied" if name in applied else "failed"
-        else:
-            for name in kvs:
-                statuses[name] = "queued"
-        return statuses
+        if not self._manager.client_no:
+            return dict.fromkeys(kvs, "queued")
+        applied = self._apply_global(kvs)
+        return {name: "applied" if name in applied else "failed" for name in kvs}
 
     def _apply_global(self, kvs: dict[str, str]) -> set[str]:
         """Apply global variables via set_global_variable."""
         applied: set[str] = set()
         if not self._manager.client_no:
             return applied
-        with self._apply_lock:
-            for name, value in kvs.items():
-                ok = False
-                try:
-                    ok = self._manager.set_global_variable(name, value)
-                except Exception as exc:  # pragma: no cover - defensive
-                    logger.debug(
-                        "set_global_variable failed (room=%s, key=%s): %s",
-                        self.room_id,
-                        name,
-                        exc,
-                    )
-                if ok:
-                    applied.add(name)
+        for name, value in kvs.items():
+            ok = False
+            try:
+                ok = self._manager.set_global_variable(name, value)
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.debug(
+                    "set_global_variable failed (room=%s, key=%s): %s",
+                    self.room_id,
+                    name,
+                    exc,
+                )
+            if ok:
+                applied.add(name)
         return applied
 
     def flush_global_vars(self) -> None:
         """Flush queued global variables for this room."""
+        # Idle rooms skip the stripe lock and the empty-dict allocation of
+        # pop() on every tick.
+        if not global_store.has_pending(self.room_id):
+            return
         pending = global_store.pop(self.room_id)
         if not pending:
             return
@@ -297,19 +413,30 @@ class BridgeManager:
         self._transform_port = transform_port
         self._sub_port = sub_port
         self._bridges: dict[str, RoomBridge] = {}
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()
+        # One ZeroMQ context (and I/O thread) shared by every room's sockets.
+        self._context: zmq.Context | None = None
 
     def get(self, room_id: str) -> RoomBridge:
         """Return an active bridge for the requested room."""
+        # Fast path without the lock: bridges are only ever added, and a
+        # single dict read is atomic under the GIL. Bridges are published only
+        # after start(), so a hit is always usable.
+        bridge = self._bridges.get(room_id)
+        if bridge is not None:
+            return bridge
         with self._lock:
             bridge = self._bridges.get(room_id)
             if bridge is None:
+                if self._context is None:
+                    self._context = zmq.Context()
                 bridge = RoomBridge(
                     self._server_addr,
                     self._dealer_port,
                     self._transform_port,
                     self._sub_port,
                     room_id,
+                    context=self._context,
                 )
                 bridge.start()
                 self._bridges[room_id] = bridge
@@ -330,7 +457,9 @@ def create_app(
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
-        allow_credentials=True,
+        # The API uses no cookies or HTTP auth. Without credentials the
+        # middleware answers with a static "*" instead of echoing Origin.
+        allow_credentials=False,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         allow_headers=["Content-Type", "Authorization"],
         max_age=3600,  # Cache preflight requests for 1 hour
@@ -339,7 +468,7 @@ def create_app(
     manager = BridgeManager(server_addr, dealer_port, transform_port, sub_port)
 
     @app.get("/")
-    def health_check() -> dict[str, str]:
+    async def health_check() -> dict[str, str]:
         """Health check endpoint."""
         return {"status": "ok"}
 
@@ -387,21 +516,32 @@ def create_app(
 
         return StreamingResponse(line_stream(), media_type="application/x-ndjson")
 
+    def _upsert_client_variables(
+        room_id: str, device_id: str, variables: dict[str, str]
+    ) -> tuple[int | None, dict[str, str]]:
+        if server is not None:
+            return server.upsert_client_variables_for_device(
+                room_id, device_id, variables
+            )
+        bridge = manager.get(room_id)
+        statuses = bridge.apply_now_or_queue(device_id, variables)
+        return bridge.get_client_no(device_id), statuses
+
     @app.post("/v1/rooms/{room_id}/devices/{device_id}/client-variables")
-    def upsert(room_id: str, device_id: str, body: UpsertBody) -> dict[str, object]:
+    async def upsert(
+        room_id: str, device_id: str, body: UpsertBody
+    ) -> dict[str, object]:
         if not body.variables:
             raise HTTPException(status_code=400, detail="variables must not be empty")
-        if server is not None:
-            try:
-                client_no, statuses = server.upsert_client_variables_for_device(
-                    room_id, device_id, body.variables
-                )
-            except ValueError as exc:
-                raise HTTPException(status_code=409, detail=str(exc)) from exc
-        else:
-            bridge = manager.get(room_id)
-            statuses = bridge.apply_now_or_queue(device_id, body.variables)
-            client_no = bridge.get_client_no(device_id)
+        # Validation and response building stay on the event loop; only the
+        # store update, which takes the server's room lock or starts a bridge,
+        # is handed to the threadpool.
+        try:
+            client_no, statuses = await run_in_threadpool(
+                _upsert_client_variables, room_id, device_id, body.variables
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
 
         return {
             "roomId": room_id,
@@ -411,7 +551,7 @@ def create_app(
         }
 
     @app.post("/v1/rooms/{room_id}/global-variables")
-    def upsert_global(room_id: str, body: UpsertBody) -> dict[str, object]:
+    def upsert_global(room_id: str, body: GlobalUpsertBody) -> dict[str, object]:
         if not body.variables:
             raise HTTPException(status_code=400, detail="variables must not be empty")
 
@@ -429,6 +569,7 @@ def create_app(
                 global_store.upsert(room_id, queued)
             except ValueError as exc:
                 raise HTTPException(status_code=409, detail=str(exc)) from exc
+            bridge.wake()
 
         return {
             "roomId": room_id,
@@ -442,13 +583,12 @@ def create_app(
 
     @app.get("/v1/rooms/{room_id}/global-variables/{name}")
     def get_global_variable(room_id: str, name: VarName) -> dict[str, object]:
-        bridge = manager.get(room_id)
-        variables = bridge.get_global_variables()
-        if name not in variables:
+        value = manager.get(room_id).get_global_variable(name)
+        if value is None:
             raise HTTPException(
                 status_code=404, detail=f"Global variable '{name}' not found"
             )
-        return {"value": variables[name]}
+        return {"value": value}
 
     @app.get("/v1/rooms/{room_id}/devices/{device_id}/client-variables")
     def get_client_variables(room_id: str, device_id: str) -> dict[str, object]:
@@ -515,14 +655,57 @@ def _parse_iso_datetime(value: str, field_name: str) -> datetime:
         raise ValueError(f"{field_name} must be an ISO 8601 timestamp") from exc
 
 
+def default_threadpool_size() -> int:
+    """Worker threads for sync REST handlers: one per CPU, at most eight."""
+    return min(os.cpu_count() or 1, 8)
+
+
+class _ThreadpoolLimitMiddleware:
+    """Apply a thread limit to the AnyIO threadpool used by sync handlers.
+
+    The limiter belongs to the server's event loop, and lifespan events are
+    disabled, so it is sized on the first request instead of at startup.
+    """
+
+    def __init__(self, app: Any, total_tokens: int) -> None:
+        self.app = app
+        self._total_tokens = total_tokens
+        self._configured = False
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if not self._configured:
+            limiter = to_thread.current_default_thread_limiter()
+            limiter.total_tokens = self._total_tokens
+            self._configured = True
+        await self.app(scope, receive, send)
+
+
 def run_uvicorn_in_thread(
-    app: FastAPI, host: str = "0.0.0.0", port: int = 8800
+    app: FastAPI,
+    host: str = "0.0.0.0",
+    port: int = 8800,
+    threadpool_size: int | None = None,
 ) -> tuple[threading.Thread, uvicorn.Server]:
-    """Spawn a Uvicorn server after binding its socket in the caller thread."""
+    """Spawn a Uvicorn server after binding its socket in the caller thread.
+
+    ``threadpool_size`` caps the threads serving sync endpoints (default:
+    :func:`default_threadpool_size`), keeping the bridge from competing with
+    the ZeroMQ threads for the GIL with AnyIO's default 40 workers.
+    """
     import uvicorn
 
+    if threadpool_size is None:
+        threadpool_size = default_threadpool_size()
+    if threadpool_size < 1:
+        raise ValueError("threadpool_size must be at least 1")
+
     config = uvicorn.Config(
-        app=app, host=host, port=port, log_level="warning", lifespan="off"
+        app=_ThreadpoolLimitMiddleware(app, threadpool_size),
+        host=host,
+        port=port,
+        log_level="warning",
+        access_log=False,
+        lifespan="off",
     )
     server = uvicorn.Server(config=config)
     try:
@@ -16,10 +16,13 @@ import argparse
 import base64
 import os
 import platform
+import selectors
 import socket
 import threading
 import time
 import traceback
+from collections import deque
+from collections.abc import Callable
 from functools import lru_cache
 from pathlib import Path
 from queue import Empty, Full, Queue
@@ -57,6 +60,9 @@ if TYPE_CHECKING:
 # Note: Default values are defined in default.toml, not in code.
 # Use load_default_config() from config module to get defaults.
 
+# Per-client header in MSG_ROOM_POSE: clientNo (ushort) + poseTime (double)
+_ROOM_POSE_CLIENT_HEADER = struct.Struct("<Hd")
+
 
 def valid_port(value: str) -> int:
     """Return a validated TCP/UDP port number."""
@@ -158,6 +164,7 @@ class NetSyncServer:
     # - TRANSFORM_BUDGET_BYTES_PER_SEC: Token bucket rate limit for transform broadcasts
     # - BACKLOG_SLEEP_SEC: Sleep duration when control backlog is high (5ms)
     # - MAX_COALESCE_BUFFER_SIZE: Max rooms in coalesce buffer before dropping oldest
+    # - TRANSFORM_SEND_BATCH: Max coalesced transforms sent back-to-back per publisher loop
     # - ROUTER_CTRL_DRAIN_BATCH: Max control messages to drain via ROUTER per receive loop
     # - ROUTER_CTRL_QUEUE_MAXSIZE: Max size for router control queue (ring buffer)
     CTRL_DRAIN_BATCH = 256
@@ -167,6 +174,7 @@ class NetSyncServer:
     TRANSFORM_BUDGET_BYTES_PER_SEC = 15_000_000
     BACKLOG_SLEEP_SEC = 0.005
     MAX_COALESCE_BUFFER_SIZE = 1000
+    TRANSFORM_SEND_BATCH = 32
 
     def __init__(
         self,
@@ -265,6 +273,24 @@ class NetSyncServer:
         self._router_queue_ctrl: Queue[tuple[bytes, bytes, bytes]] = Queue(
             maxsize=self.ROUTER_CTRL_QUEUE_MAXSIZE
         )
+        # Self-pipe that wakes the receive loop's poll for queued control
+        # messages and shutdown. A plain socket pair rather than an inproc
+        # ZeroMQ socket, because any thread may write to it.
+        self._receive_wake_r, self._receive_wake_w = socket.socketpair()
+        self._receive_wake_r.setblocking(False)
+        self._receive_wake_w.setblocking(False)
+        # Same pattern for the UDP/TCP discovery loops, which otherwise block
+        # in recvfrom/accept until shutdown. Each loop has its own pair so
+        # stopping one never wakes the other.
+        self._udp_discovery_wake_r, self._udp_discovery_wake_w = socket.socketpair()
+        self._tcp_discovery_wake_r, self._tcp_discovery_wake_w = socket.socketpair()
+        for wake_sock in (
+            self._udp_discovery_wake_r,
+            self._udp_discovery_wake_w,
+            self._tcp_discovery_wake_r,
+            self._tcp_discovery_wake_w,
+        ):
+            wake_sock.setblocking(False)
 
         # Statistics for router control messages
         self.ctrl_unicast_sent = 0
@@ -350,7 +376,8 @@ class NetSyncServer:
         self.room_last_nv_flush: dict[str, float] = {}  # room_id -> last_flush_time
 
         # NV monitoring window (sliding window for logging only)
-        self.nv_monitor_window: dict[str, list] = {}  # room_id -> [timestamps]
+        # room_id -> request timestamps, oldest first
+        self.nv_monitor_window: dict[str, deque[float]] = {}
         self.nv_monitor_window_size = config.nv_monitor_window_size
         self.nv_monitor_threshold = config.nv_monitor_threshold
 
@@ -361,6 +388,18 @@ class NetSyncServer:
         self.room_object_dirty: dict[str, bool] = {}
         self._room_last_object_broadcast: dict[str, float] = {}
 
+        # UTF-8 encoded room IDs used as PUB topics and ROUTER room frames
+        self.room_topic_bytes: dict[str, bytes] = {}
+        # room_id -> (client count, serialized client entries) of the last
+        # MSG_ROOM_POSE, reused while the room stays clean
+        self.room_pose_section_cache: dict[str, tuple[int, bytes]] = {}
+        # room_id -> serialized full MSG_GLOBAL_VAR_SYNC, dropped on every write
+        self.global_var_sync_cache: dict[str, bytes] = {}
+        # room_id -> (mappings, serialized MSG_DEVICE_ID_MAPPING) last sent
+        self.room_id_mapping_cache: dict[
+            str, tuple[list[tuple[int, str, bool]], bytes]
+        ] = {}
+
         # Network Variables limits (from config)
         self.MAX_GLOBAL_VARS = config.max_global_vars
         self.MAX_CLIENT_VARS = config.max_client_vars
@@ -382,7 +421,8 @@ class NetSyncServer:
         self.idle_broadcast_interval = self.IDLE_BROADCAST_INTERVAL
         self.dirty_threshold = self.DIRTY_THRESHOLD
 
-        # Statistics
+        # Statistics. message_count is written only by the receive thread and
+        # broadcast_count only by the publisher thread, so both skip the lock.
         self.message_count = 0
         self.broadcast_count = 0
         self.skipped_broadcasts = 0
@@ -391,8 +431,32 @@ class NetSyncServer:
         self._rest_thread: threading.Thread | None = None
         self._rest_server: Server | None = None
 
+        # Per-lane message handlers keyed by binary message type
+        self._control_dispatch: dict[
+            int, Callable[[bytes, str, dict[str, Any]], None]
+        ] = {
+            binary_serializer.MSG_CLIENT_HELLO: self._handle_client_hello,
+            binary_serializer.MSG_RPC: self._handle_rpc,
+            binary_serializer.MSG_GLOBAL_VAR_SET: self._handle_global_var_set_message,
+            binary_serializer.MSG_CLIENT_VAR_SET: self._handle_client_var_set_message,
+            binary_serializer.MSG_CLIENT_VAR_CLEAR: self._handle_client_var_clear,
+            binary_serializer.MSG_OBJECT_OWNERSHIP_REQUEST: (
+                self._handle_ownership_request_message
+            ),
+        }
+        self._transform_dispatch: dict[
+            int, Callable[[bytes, str, dict[str, Any], bytes], None]
+        ] = {
+            binary_serializer.MSG_CLIENT_POSE: self._handle_client_transform,
+            binary_serializer.MSG_OBJECT_POSE: self._handle_object_pose_message,
+        }
+
     def _increment_stat(self, stat_name: str, amount: int = 1) -> None:
-        """Thread-safe increment of statistics"""
+        """Thread-safe increment of statistics.
+
+        Counters written by a single thread are bumped directly by that thread
+        instead; only counters with several writers need the lock.
+        """
         with self._stats_lock:
             setattr(self, stat_name, getattr(self, stat_name) + amount)
 
@@ -529,7 +593,7 @@ class NetSyncServer:
 
         try:
             pub.send_multipart([topic_bytes, message_bytes], flags=zmq.DONTWAIT)
-            self._increment_stat("broadcast_count")
+            self.broadcast_count += 1
             with self._coalesce_lock:
                 # Remove only if the message is still the latest.
                 if self._coalesce_latest.get(topic_bytes) == message_bytes:
@@ -598,7 +662,7 @@ class NetSyncServer:
                         self.pub.send_multipart(
                             [topic_bytes, message_bytes], flags=zmq.DONTWAIT
                         )
-                        self._increment_stat("broadcast_count")
+                        self.broadcast_count += 1
                     except zmq.Again:
                         # Socket buffer full; drop the message (PUB-SUB is unreliable by design)
                         self._increment_stat("control_drop_count")
@@ -614,7 +678,14 @@ class NetSyncServer:
                     time.sleep(self.BACKLOG_SLEEP_SEC)
                     continue
 
-                transform_sent = self._try_send_transform()
+                # Send this tick's room frames back-to-back so ZMQ can batch
+                # them, returning to the control queue after a bounded burst.
+                transform_sent = 0
+                while (
+                    transform_sent < self.TRANSFORM_SEND_BATCH
+                    and self._try_send_transform()
+                ):
+                    transform_sent += 1
                 if drained == 0 and not transform_sent:
                     time.sleep(self.BACKLOG_SLEEP_SEC)
 
@@ -674,12 +745,23 @@ class NetSyncServer:
             room_id: Room ID string
             message_bytes: Serialized message payload
         """
-        room_bytes = room_id.encode("utf-8")
+        room_bytes = self._room_topic(room_id)
         try:
             self._router_queue_ctrl.put_nowait((identity, room_bytes, message_bytes))
         except Full:
             self._increment_stat("ctrl_unicast_dropped")
             logger.warning("Router control queue full: dropping new control message")
+            return
+        self._wake_receive_loop()
+
+    def _wake_receive_loop(self) -> None:
+        """Interrupt the receive loop's poll from any thread."""
+        try:
+            self._receive_wake_w.send(b"\0")
+        except OSError:
+            # A full buffer already guarantees a pending wakeup; a closed pair
+            # means the server has stopped.
+            pass
 
     def _send_ctrl_to_room_via_router(
         self,
@@ -716,39 +798,66 @@ class NetSyncServer:
         for identity in identities_to_send:
             self._enqueue_router(identity, room_id, message_bytes)
 
-    def _get_or_assign_client_no(self, room_id: str, device_id: str) -> int:
-        """Get existing client number or assign a new one for the given device ID in the room"""
+    def _get_or_assign_client_no(
+        self, room_id: str, device_id: str, now: float | None = None
+    ) -> int:
+        """Get existing client number or assign a new one for the given device ID in the room
+
+        ``now`` is the caller's time.monotonic() reading, if it already has one.
+        """
         with self._rooms_lock:
-            # Initialize room structures if needed
-            self._initialize_room(room_id)
+            return self._get_or_assign_client_no_locked(room_id, device_id, now)
 
-            # Update last seen time
-            self.device_id_last_seen[device_id] = time.monotonic()
-
-            # Check if device ID already has a client number in this room
-            if device_id in self.room_device_id_to_client_no[room_id]:
-                return self.room_device_id_to_client_no[room_id][device_id]
-
-            # Assign new client number
-            client_no = self.room_client_no_counters[room_id]
-            if client_no > 65535:  # Max value for 2 bytes
-                # Find and reuse expired client numbers
-                client_no = self._find_reusable_client_no(room_id)
-                if client_no == -1:
-                    raise ValueError(
-                        f"Room {room_id} has exhausted all available client numbers"
-                    )
-            else:
-                self.room_client_no_counters[room_id] += 1
+    def _get_or_assign_client_no_locked(
+        self, room_id: str, device_id: str, now: float | None = None
+    ) -> int:
+        """Same as _get_or_assign_client_no; caller must hold _rooms_lock."""
+        if now is None:
+            now = time.monotonic()
+
+        # Fast path for a device already mapped in an existing room
+        mapping = self.room_device_id_to_client_no.get(room_id)
+        if mapping is not None:
+            existing = mapping.get(device_id)
+            if existing is not None:
+                self.device_id_last_seen[device_id] = now
+                return existing
+
+        # Initialize room structures if needed
+        self._initialize_room(room_id)
+
+        # Update last seen time
+        self.device_id_last_seen[device_id] = now
+
+        # Assign new client number
+        client_no = self.room_client_no_counters[room_id]
+        if client_no > 65535:  # Max value for 2 bytes
+            # Find and reuse expired client numbers
+            client_no = self._find_reusable_client_no(room_id)
+            if client_no == -1:
+                raise ValueError(
+                    f"Room {room_id} has exhausted all available client numbers"
+                )
+        else:
+            self.room_client_no_counters[room_id] += 1
 
-            # Store mappings
-            self.room_device_id_to_client_no[room_id][device_id] = client_no
-            self.room_client_no_to_device_id[room_id][client_no] = device_id
+        # Store mappings
+        self.room_device_id_to_client_no[room_id][device_id] = client_no
+        self.room_client_no_to_device_id[room_id][client_no] = device_id
 
-            logger.info(
-                f"Assigned client number {client_no} to device ID {device_id[:8]}... in room {room_id}"
-            )
-            return client_no
+        logger.info(
+            f"Assigned client number {client_no} to device ID {device_id[:8]}... in room {room_id}"
+        )
+        return client_no
+
+    def _room_topic(self, room_id: str) -> bytes:
+        """Return the encoded room ID, cached for rooms that exist."""
+        topic = self.room_topic_bytes.get(room_id)
+        if topic is None:
+            # Rooms removed concurrently (or never created) are encoded on demand
+            # rather than re-added to the cache.
+            topic = room_id.encode("utf-8")
+        return topic
 
     def _initialize_room(self, room_id: str) -> None:
         """Initialize all room-related data structures"""
@@ -771,12 +880,14 @@ class NetSyncServer:
             self.room_last_nv_flush[room_id] = 0
 
             # Initialize monitoring window
-            self.nv_monitor_window[room_id] = []
+            self.nv_monitor_window[room_id] = deque()
 
             # Initialize object sync for the room
             self.room_objects[room_id] = {}
             self.room_object_dirty[room_id] = False
 
+            self.room_topic_bytes[room_id] = room_id.encode("utf-8")
+
             logger.info(f"Created new room: {room_id}")
 
     def _refresh_control_identity_from_device_id(
@@ -790,7 +901,7 @@ class NetSyncServer:
         now = time.monotonic()
         with self._rooms_lock:
             self._initialize_room(room_id)
-            client_no = self._get_or_assign_client_no(room_id, device_id)
+            client_no = self._get_or_assign_client_no_locked(room_id, device_id, now)
             room = self.rooms[room_id]
 
             if device_id not in room:
@@ -841,7 +952,7 @@ class NetSyncServer:
         )
         if device_id is None:
             logger.warning(
-                "%s ignored: missing or invalid deviceId in room %s",
+                "{} ignored: missing or invalid deviceId in room {}",
                 message_name,
                 room_id,
             )
@@ -850,7 +961,7 @@ class NetSyncServer:
         client_no = self._get_client_no_for_device_id(room_id, device_id)
         if client_no <= 0:
             logger.warning(
-                "%s ignored: device %s is not mapped in room %s",
+                "{} ignored: device {} is not mapped in room {}",
                 message_name,
                 device_id,
                 room_id,
@@ -904,33 +1015,33 @@ class NetSyncServer:
     def _cleanup_expired_device_id_mappings(self, current_time: float) -> None:
         """Clean up expired device ID to client number mappings"""
         with self._rooms_lock:
-            expired_device_ids = []
-
             # Find expired device IDs
-            for device_id, last_seen in list(self.device_id_last_seen.items()):
-                if current_time - last_seen > self.DEVICE_ID_EXPIRY_TIME:
-                    expired_device_ids.append(device_id)
+            expiry = self.DEVICE_ID_EXPIRY_TIME
+            expired_device_ids = {
+                device_id
+                for device_id, last_seen in self.device_id_last_seen.items()
+                if current_time - last_seen > expiry
+            }
+            if not expired_device_ids:
+                return
 
-            # Remove expired mappings
             for device_id in expired_device_ids:
                 del self.device_id_last_seen[device_id]
 
-                # Remove from all room mappings
-                for room_id in list(self.room_device_id_to_client_no.keys()):
-                    if device_id in self.room_device_id_to_client_no[room_id]:
-                        client_no = self.room_device_id_to_client_no[room_id][device_id]
-                        del self.room_device_id_to_client_no[room_id][device_id]
-                        if client_no in self.room_client_no_to_device_id[room_id]:
-                            del self.room_client_no_to_device_id[room_id][client_no]
-                        self.client_variables.get(room_id, {}).pop(device_id, None)
-                        logger.info(
-                            f"Cleaned up expired device ID {device_id[:8]}... (client number: {client_no}) from room {room_id}"
-                        )
+            # Remove from room mappings in one pass over the rooms, touching
+            # only the expired devices each room actually maps.
+            for room_id, device_map in self.room_device_id_to_client_no.items():
+                for device_id in expired_device_ids & device_map.keys():
+                    client_no = device_map.pop(device_id)
+                    self.room_client_no_to_device_id[room_id].pop(client_no, None)
+                    self.client_variables.get(room_id, {}).pop(device_id, None)
+                    logger.info(
+                        f"Cleaned up expired device ID {device_id[:8]}... (client number: {client_no}) from room {room_id}"
+                    )
 
-            if expired_device_ids:
-                logger.info(
-                    f"Cleaned up {len(expired_device_ids)} expired device ID mappings"
-                )
+            logger.info(
+                f"Cleaned up {len(expired_device_ids)} expired device ID mappings"
+            )
 
     def start(self, ip_addresses: list[str] | None = None) -> None:
         """Start the server"""
@@ -1058,6 +1169,7 @@ class NetSyncServer:
         """Stop the server"""
         logger.info("Stopping server...")
         self.running = False
+        self._wake_receive_loop()
 
         # Stop server discovery
         if self.server_discovery_running or self.tcp_server_discovery_running:
@@ -1110,6 +1222,12 @@ class NetSyncServer:
         self._close_router_sockets()
         if self.context:
             self.context.term()
+        self._receive_wake_r.close()
+        self._receive_wake_w.close()
+        self._udp_discovery_wake_r.close()
+        self._udp_discovery_wake_w.close()
+        self._tcp_discovery_wake_r.close()
+        self._tcp_discovery_wake_w.close()
 
         logger.info(
             f"Server stopped. Total messages processed: {self.message_count}, "
@@ -1140,10 +1258,18 @@ class NetSyncServer:
             poller.register(control_router, zmq.POLLIN)
         if transform_router is not None:
             poller.register(transform_router, zmq.POLLIN)
+        wake_fd = self._receive_wake_r.fileno()
+        poller.register(wake_fd, zmq.POLLIN)
 
         while self.running:
             try:
-                events = dict(poller.poll(self.POLL_TIMEOUT))
+                # Block until traffic, a queued control message, or stop()
+                # wakes the poll. POLL_TIMEOUT only paces retries of control
+                # messages deferred by socket backpressure.
+                timeout = None if self._router_queue_ctrl.empty() else self.POLL_TIMEOUT
+                events = dict(poller.poll(timeout))
+                if wake_fd in events:
+                    self._drain_receive_wakeups()
                 if control_router is not None and control_router in events:
                     self._drain_incoming_router(control_router, "control")
                 if transform_router is not None and transform_router in events:
@@ -1157,35 +1283,53 @@ class NetSyncServer:
 
         logger.info("Receive loop ended")
 
+    def _drain_receive_wakeups(self) -> None:
+        """Consume pending self-pipe wakeup bytes."""
+        try:
+            while self._receive_wake_r.recv(4096):
+                pass
+        except OSError:
+            pass
+
     def _drain_incoming_router(
         self, router: zmq.sugar.socket.Socket[bytes], lane: str
     ) -> None:
         """Drain all currently available messages from one ROUTER socket."""
-        while True:
-            try:
-                parts = router.recv_multipart(flags=zmq.DONTWAIT)
-            except zmq.Again:
-                break
+        received = 0
+        # Bound once per drain: a burst can hold thousands of messages.
+        recv_multipart = router.recv_multipart
+        handle_message = self._handle_incoming_router_message
+        again = zmq.Again
+        try:
+            while True:
+                try:
+                    parts = recv_multipart(flags=zmq.DONTWAIT)
+                except again:
+                    break
 
-            self._increment_stat("message_count")
-            # Isolate per-message failures: a single malformed message or a
-            # throwing handler must not abort draining the rest of this socket's
-            # backlog (which would stall every other client until the next poll).
-            try:
-                self._handle_incoming_router_message(lane, parts)
-            except Exception as exc:
-                logger.warning(
-                    "Failed to handle %s-lane message (%d parts): %s",
-                    lane,
-                    len(parts),
-                    exc,
-                )
+                received += 1
+                # Isolate per-message failures: a single malformed message or a
+                # throwing handler must not abort draining the rest of this
+                # socket's backlog (which would stall every other client until
+                # the next poll).
+                try:
+                    handle_message(lane, parts)
+                except Exception as exc:
+                    logger.warning(
+                        "Failed to handle {}-lane message ({} parts): {}",
+                        lane,
+                        len(parts),
+                        exc,
+                    )
+        finally:
+            # Counted once per drained batch rather than per message.
+            self.message_count += received
 
     def _handle_incoming_router_message(self, lane: str, parts: list[bytes]) -> None:
         """Dispatch one incoming ROUTER multipart message for a specific lane."""
         if len(parts) < 3:
             logger.warning(
-                "Received incomplete %s message with %s parts", lane, len(parts)
+                "Received incomplete {} message with {} parts", lane, len(parts)
             )
             return
 
@@ -1195,12 +1339,12 @@ class NetSyncServer:
         try:
             room_id = room_id_bytes.decode("utf-8")
         except UnicodeDecodeError as exc:
-            logger.error("Failed to decode room ID on %s lane: %s", lane, exc)
+            logger.error("Failed to decode room ID on {} lane: {}", lane, exc)
             return
 
         msg_type, data, raw_payload = binary_serializer.deserialize(message_bytes)
         if data is None:
-            logger.warning("Received invalid %s-lane message type %s", lane, msg_type)
+            logger.warning("Received invalid {}-lane message type {}", lane, msg_type)
             return
 
         if lane == "control":
@@ -1214,43 +1358,11 @@ class NetSyncServer:
         self, client_identity: bytes, room_id: str, msg_type: int, data: dict[str, Any]
     ) -> None:
         """Handle one message received on the control lane."""
-        if msg_type == binary_serializer.MSG_CLIENT_HELLO:
-            self._handle_client_hello(client_identity, room_id, data)
-        elif msg_type == binary_serializer.MSG_RPC:
-            sender = self._resolve_control_sender(client_identity, room_id, data, "RPC")
-            if sender is None:
-                return
-            self._send_rpc_to_room(room_id, data)
-        elif msg_type == binary_serializer.MSG_GLOBAL_VAR_SET:
-            sender = self._resolve_control_sender(
-                client_identity, room_id, data, "Global variable set"
-            )
-            if sender is None:
-                return
-            self._buffer_global_var_set(room_id, data)
-            self._monitor_nv_sliding_window(room_id)
-        elif msg_type == binary_serializer.MSG_CLIENT_VAR_SET:
-            sender = self._resolve_control_sender(
-                client_identity, room_id, data, "Client variable set"
-            )
-            if sender is None:
-                return
-            self._buffer_client_var_set(room_id, data)
-            self._monitor_nv_sliding_window(room_id)
-        elif msg_type == binary_serializer.MSG_CLIENT_VAR_CLEAR:
-            self._handle_client_var_clear(client_identity, room_id, data)
-        elif msg_type == binary_serializer.MSG_OBJECT_OWNERSHIP_REQUEST:
-            sender = self._resolve_control_sender(
-                client_identity, room_id, data, "Object ownership request"
-            )
-            if sender is None:
-                return
-            _, sender_client_no = sender
-            self._handle_object_ownership_request(
-                client_identity, room_id, sender_client_no, data
-            )
-        else:
+        handler = self._control_dispatch.get(msg_type)
+        if handler is None:
             self._drop_wrong_lane("control", room_id, msg_type)
+            return
+        handler(client_identity, room_id, data)
 
     def _handle_transform_message(
         self,
@@ -1261,28 +1373,83 @@ class NetSyncServer:
         raw_payload: bytes,
     ) -> None:
         """Handle one message received on the transform lane."""
-        if msg_type == binary_serializer.MSG_CLIENT_POSE:
-            self._handle_client_transform(client_identity, room_id, data, raw_payload)
-        elif msg_type == binary_serializer.MSG_OBJECT_POSE:
-            # Attribute the pose using the deviceId carried in the payload, not the
-            # transform-lane socket identity. A stealth owner registers only on the
-            # control lane and never sends MSG_CLIENT_POSE, so it never binds a
-            # transform_identity; relying on that identity would silently drop its
-            # object poses.
-            sender_device_id = data.get("deviceId")
-            if isinstance(sender_device_id, str) and sender_device_id:
-                sender_client_no = self._get_or_assign_client_no(
-                    room_id, sender_device_id
-                )
-                self._handle_object_pose(room_id, sender_client_no, data)
-        else:
+        handler = self._transform_dispatch.get(msg_type)
+        if handler is None:
             self._drop_wrong_lane("transform", room_id, msg_type)
+            return
+        handler(client_identity, room_id, data, raw_payload)
+
+    def _handle_rpc(
+        self, client_identity: bytes, room_id: str, data: dict[str, Any]
+    ) -> None:
+        """Relay an RPC from a known control-lane sender to its room."""
+        sender = self._resolve_control_sender(client_identity, room_id, data, "RPC")
+        if sender is None:
+            return
+        self._send_rpc_to_room(room_id, data)
+
+    def _handle_global_var_set_message(
+        self, client_identity: bytes, room_id: str, data: dict[str, Any]
+    ) -> None:
+        """Buffer a global variable write from a known control-lane sender."""
+        sender = self._resolve_control_sender(
+            client_identity, room_id, data, "Global variable set"
+        )
+        if sender is None:
+            return
+        self._buffer_global_var_set(room_id, data)
+        self._monitor_nv_sliding_window(room_id)
+
+    def _handle_client_var_set_message(
+        self, client_identity: bytes, room_id: str, data: dict[str, Any]
+    ) -> None:
+        """Buffer a client variable write from a known control-lane sender."""
+        sender = self._resolve_control_sender(
+            client_identity, room_id, data, "Client variable set"
+        )
+        if sender is None:
+            return
+        self._buffer_client_var_set(room_id, data)
+        self._monitor_nv_sliding_window(room_id)
+
+    def _handle_ownership_request_message(
+        self, client_identity: bytes, room_id: str, data: dict[str, Any]
+    ) -> None:
+        """Handle an object ownership request from a known control-lane sender."""
+        sender = self._resolve_control_sender(
+            client_identity, room_id, data, "Object ownership request"
+        )
+        if sender is None:
+            return
+        _, sender_client_no = sender
+        self._handle_object_ownership_request(
+            client_identity, room_id, sender_client_no, data
+        )
+
+    def _handle_object_pose_message(
+        self,
+        client_identity: bytes,
+        room_id: str,
+        data: dict[str, Any],
+        raw_payload: bytes,
+    ) -> None:
+        """Handle an object pose received on the transform lane."""
+        # Attribute the pose using the deviceId carried in the payload, not the
+        # transform-lane socket identity. A stealth owner registers only on the
+        # control lane and never sends MSG_CLIENT_POSE, so it never binds a
+        # transform_identity; relying on that identity would silently drop its
+        # object poses.
+        sender_device_id = data.get("deviceId")
+        if isinstance(sender_device_id, str) and sender_device_id:
+            sender_client_no = self._get_or_assign_client_no(room_id, sender_device_id)
+            self._handle_object_pose(room_id, sender_client_no, data)
 
     def _drop_wrong_lane(self, lane: str, room_id: str, msg_type: int) -> None:
         """Record and log a message received on the wrong transport lane."""
-        self._increment_stat("wrong_lane_dropped")
+        # Only the receive thread dispatches router messages.
+        self.wrong_lane_dropped += 1
         logger.warning(
-            "Dropped wrong-lane message: lane=%s room=%s msg_type=%s",
+            "Dropped wrong-lane message: lane={} room={} msg_type={}",
             lane,
             room_id,
             msg_type,
@@ -1336,7 +1503,8 @@ class NetSyncServer:
                 router.send_multipart(
                     [ident, room_bytes, msg_bytes], flags=zmq.DONTWAIT
                 )
-                self._increment_stat("ctrl_unicast_sent")
+                # Only the receive thread drains the control queue.
+                self.ctrl_unicast_sent += 1
             except zmq.Again:
                 # Defer this identity to the tail so one slow client does not
                 # head-of-line block control messages for the rest of the room.
@@ -1348,7 +1516,7 @@ class NetSyncServer:
                     exc, "errno", None
                 ) == getattr(zmq, "EHOSTUNREACH", None):
                     self._increment_stat("ctrl_unicast_unreachable")
-                    logger.warning("Router control identity unreachable: %s", exc)
+                    logger.warning("Router control identity unreachable: {}", exc)
                 else:
                     self._increment_stat("ctrl_unicast_dropped")
                     logger.error(f"Router send error: {exc}")
@@ -1376,7 +1544,7 @@ class NetSyncServer:
         now = time.monotonic()
 
         with self._rooms_lock:
-            client_no = self._get_or_assign_client_no(room_id, device_id)
+            client_no = self._get_or_assign_client_no_locked(room_id, device_id, now)
             is_new_client = device_id not in self.rooms[room_id]
             is_reconnect = False
             stealth_changed = False
@@ -1398,8 +1566,8 @@ class NetSyncServer:
                 self.room_id_mapping_dirty[room_id] = True
                 stealth_text = " (stealth mode)" if is_stealth else ""
                 logger.info(
-                    "New client %s... (client number: %s)%s registered control lane "
-                    "in room %s",
+                    "New client {}... (client number: {}){} registered control lane "
+                    "in room {}",
                     device_id[:8],
                     client_no,
                     stealth_text,
@@ -1419,7 +1587,7 @@ class NetSyncServer:
                 if is_reconnect or stealth_changed:
                     self.room_id_mapping_dirty[room_id] = True
 
-            if is_stealth:
+            if is_stealth or stealth_changed:
                 self.room_dirty_flags[room_id] = True
 
         if is_new_client:
@@ -1441,7 +1609,11 @@ class NetSyncServer:
         data: dict[str, Any],
         raw_payload: bytes = b"",
     ) -> None:
-        """Handle client transform update"""
+        """Handle client transform update
+
+        ``data`` is the fresh dict returned by the deserializer for this
+        message; it is annotated with ``clientNo`` in place and stored.
+        """
         device_id_raw = data.get("deviceId")  # Receiving device ID from client
         if device_id_raw is None or not isinstance(device_id_raw, str):
             logger.warning("Received client transform with missing or invalid deviceId")
@@ -1452,18 +1624,13 @@ class NetSyncServer:
         # Detect stealth mode using flags
         is_stealth = binary_serializer._is_stealth_client(data)
 
-        # Get or assign client number for this device ID
-        client_no = self._get_or_assign_client_no(room_id, device_id)
-
-        # Create modified data with client number for internal use
-        data_with_client_no = data.copy()
-        data_with_client_no["clientNo"] = client_no
-        data_with_client_no["deviceId"] = device_id  # Keep device ID for reference
-
+        now = time.monotonic()
         control_identity = None
+        # One lock acquisition covers client number assignment (which also
+        # creates the room) and the client record update.
         with self._rooms_lock:
-            # Create room if it doesn't exist
-            self._initialize_room(room_id)
+            client_no = self._get_or_assign_client_no_locked(room_id, device_id, now)
+            data["clientNo"] = client_no
 
             # Update or create client (using device ID as key for backward compatibility)
             is_new_client = device_id not in self.rooms[room_id]
@@ -1472,8 +1639,8 @@ class NetSyncServer:
                 self.rooms[room_id][device_id] = {
                     "control_identity": None,
                     "transform_identity": client_identity,
-                    "last_update": time.monotonic(),
-                    "transform_data": data_with_client_no,
+                    "last_update": now,
+                    "transform_data": data,
                     "client_no": client_no,
                     "is_stealth": is_stealth,
                 }
@@ -1482,7 +1649,11 @@ class NetSyncServer:
                     self.client_transform_body_cache[client_no] = body_bytes
                 stealth_text = " (stealth mode)" if is_stealth else ""
                 logger.info(
-                    f"New client {device_id[:8]}... (client number: {client_no}){stealth_text} joined room {room_id}"
+                    "New client {}... (client number: {}){} joined room {}",
+                    device_id[:8],
+                    client_no,
+                    stealth_text,
+                    room_id,
                 )
             else:
                 # Update existing client and mark room as dirty.
@@ -1491,8 +1662,8 @@ class NetSyncServer:
                 old_identity = self.rooms[room_id][device_id].get("transform_identity")
                 is_reconnect = old_identity != client_identity
                 self.rooms[room_id][device_id]["transform_identity"] = client_identity
-                self.rooms[room_id][device_id]["transform_data"] = data_with_client_no
-                self.rooms[room_id][device_id]["last_update"] = time.monotonic()
+                self.rooms[room_id][device_id]["transform_data"] = data
+                self.rooms[room_id][device_id]["last_update"] = now
                 self.rooms[room_id][device_id]["client_no"] = client_no
                 self.rooms[room_id][device_id]["is_stealth"] = is_stealth
 
@@ -1507,7 +1678,9 @@ class NetSyncServer:
                     # this device/client registration.
                     self.room_id_mapping_dirty[room_id] = True
                     logger.info(
-                        f"Client {device_id[:8]}... reconnected with new identity in room {room_id}"
+                        "Client {}... reconnected with new identity in room {}",
+                        device_id[:8],
+                        room_id,
                     )
 
             # Mark room for debounced ID mapping broadcast when a new client joins
@@ -1620,8 +1793,10 @@ class NetSyncServer:
                 if previous_owner == sender_client_no:
                     obj_state["owner_client_no"] = 0
                     logger.info(
-                        f"Object '{object_id}' released by client "
-                        f"{sender_client_no} in room {room_id}"
+                        "Object '{}' released by client {} in room {}",
+                        object_id,
+                        sender_client_no,
+                        room_id,
                     )
                     changed_msg = binary_serializer.serialize_object_ownership_changed(
                         object_id, 0, previous_owner
@@ -1641,8 +1816,10 @@ class NetSyncServer:
             elif operation_type == 2:  # RequestOwnership
                 obj_state["owner_client_no"] = sender_client_no
                 logger.info(
-                    f"Object '{object_id}' ownership taken by client "
-                    f"{sender_client_no} in room {room_id}"
+                    "Object '{}' ownership taken by client {} in room {}",
+                    object_id,
+                    sender_client_no,
+                    room_id,
                 )
                 changed_msg = binary_serializer.serialize_object_ownership_changed(
                     object_id, sender_client_no, previous_owner
@@ -1675,7 +1852,7 @@ class NetSyncServer:
         if not message_bytes:
             return
         # Use separate topic for objects: roomId + "\x00obj"
-        topic_bytes = room_id.encode("utf-8") + b"\x00obj"
+        topic_bytes = self._room_topic(room_id) + b"\x00obj"
         self._enqueue_pub_latest(topic_bytes, message_bytes)
 
     def _send_rpc_to_room(self, room_id: str, rpc_data: dict[str, Any]) -> None:
@@ -1687,8 +1864,15 @@ class NetSyncServer:
         function_name = rpc_data.get("functionName", "unknown")
         args = rpc_data.get("args", [])
         target_client_nos = rpc_data.get("targetClientNos", [])
+        # Per-message logs pass arguments instead of f-strings so loguru
+        # skips formatting entirely when INFO is filtered out.
         logger.info(
-            f"RPC: sender={sender_client_no}, targets={target_client_nos}, function={function_name}, args={args}, room={room_id}"
+            "RPC: sender={}, targets={}, function={}, args={}, room={}",
+            sender_client_no,
+            target_client_nos,
+            function_name,
+            args,
+            room_id,
         )
 
         message_bytes = binary_serializer.serialize_rpc_message(rpc_data)
@@ -1718,22 +1902,22 @@ class NetSyncServer:
         """Monitor NV request rate for logging only (no gating)"""
         current_time = time.monotonic()
         with self._rooms_lock:
-            if room_id not in self.nv_monitor_window:
-                self.nv_monitor_window[room_id] = []
-
-            window = self.nv_monitor_window[room_id]
+            window = self.nv_monitor_window.get(room_id)
+            if window is None:
+                window = self.nv_monitor_window[room_id] = deque()
 
             # Add current timestamp
             window.append(current_time)
 
-            # Remove old timestamps outside window
+            # Timestamps are appended in order, so stale ones are all at the head
             cutoff_time = current_time - self.nv_monitor_window_size
-            self.nv_monitor_window[room_id] = [t for t in window if t > cutoff_time]
+            while window and window[0] <= cutoff_time:
+                window.popleft()
 
             # Check if over threshold and log warning
-            if len(self.nv_monitor_window[room_id]) > self.nv_monitor_threshold:
+            if len(window) > self.nv_monitor_threshold:
                 logger.warning(
-                    f"High NV request rate in room {room_id}: {len(self.nv_monitor_window[room_id])} req/s"
+                    f"High NV request rate in room {room_id}: {len(window)} req/s"
                 )
 
     def _next_nv_seq(self, room_id: str) -> int:
@@ -1795,9 +1979,15 @@ class NetSyncServer:
                 "version": self._next_nv_seq(room_id),
                 "lastWriterClientNo": sender_client_no,
             }
+            self.global_var_sync_cache.pop(room_id, None)
 
             logger.info(
-                f"Global Variable Changed: room={room_id}, client={sender_client_no}, name='{var_name}', old='{old_value}', new='{var_value}'"
+                "Global Variable Changed: room={}, client={}, name='{}', old='{}', new='{}'",
+                room_id,
+                sender_client_no,
+                var_name,
+                old_value,
+                var_value,
             )
             return True
 
@@ -1902,7 +2092,14 @@ class NetSyncServer:
             }
 
             logger.info(
-                f"Client Variable Changed: room={room_id}, targetDevice={target_device_id}, sender={sender_client_no}, name='{var_name}', old='{old_value}', new='{var_value}'"
+                "Client Variable Changed: room={}, targetDevice={}, sender={}, "
+                "name='{}', old='{}', new='{}'",
+                room_id,
+                target_device_id,
+                sender_client_no,
+                var_name,
+                old_value,
+                var_value,
             )
             return True
 
@@ -2043,7 +2240,7 @@ class NetSyncServer:
             )
 
         logger.info(
-            "Cleared client variables: room=%s, client=%s, device=%s, deleted=%s, pending=%s",
+            "Cleared client variables: room={}, client={}, device={}, deleted={}, pending={}",
             room_id,
             client_no,
             device_id,
@@ -2071,27 +2268,23 @@ class NetSyncServer:
     def _build_global_var_sync_payload(self, room_id: str) -> bytes | None:
         """Build a serialized global-variable sync payload for the given room.
 
-        Returns None when there are no global variables to sync.
+        Returns None when there are no global variables to sync. The payload
+        is cached per room until the next applied global write.
         Caller must hold ``_rooms_lock`` (or accept that global_variables may
         be mutated concurrently — the current callers all hold the lock).
         """
-        if room_id not in self.global_variables:
-            return None
-
-        variables = []
-        for var_name, var_data in self.global_variables[room_id].items():
-            variables.append(
-                {
-                    "name": var_name,
-                    "value": var_data["value"],
-                    "lastWriterClientNo": var_data["lastWriterClientNo"],
-                }
-            )
-
+        cached = self.global_var_sync_cache.get(room_id)
+        if cached is not None:
+            return cached
+        variables = self.global_variables.get(room_id)
         if not variables:
             return None
 
-        return binary_serializer.serialize_global_var_sync({"variables": variables})
+        message_bytes = binary_serializer.serialize_global_var_sync_from_store(
+            variables
+        )
+        self.global_var_sync_cache[room_id] = message_bytes
+        return message_bytes
 
     def _build_client_var_sync_payload(
         self, room_id: str, target_client_nos: set[int] | None = None
@@ -2106,8 +2299,6 @@ class NetSyncServer:
         if room_id not in self.client_variables:
             return None
 
-        client_variables: dict[str, list[dict[str, object]]] = {}
-
         if target_client_nos is None:
             targets = [
                 (client_no, device_id)
@@ -2124,24 +2315,15 @@ class NetSyncServer:
                 if device_id is not None:
                     targets.append((client_no, device_id))
 
-        for client_no, device_id in targets:
-            variables = self.client_variables[room_id].get(device_id, {})
-            client_vars: list[dict[str, object]] = []
-            for var_name, var_data in variables.items():
-                client_vars.append(
-                    {
-                        "name": var_name,
-                        "value": var_data["value"],
-                        "lastWriterClientNo": var_data["lastWriterClientNo"],
-                    }
-                )
-            client_variables[str(client_no)] = client_vars
-
-        if not client_variables:
+        if not targets:
             return None
 
-        return binary_serializer.serialize_client_var_sync(
-            {"clientVariables": client_variables}
+        room_vars = self.client_variables[room_id]
+        return binary_serializer.serialize_client_var_sync_from_store(
+            [
+                (client_no, room_vars.get(device_id, {}))
+                for client_no, device_id in targets
+            ]
         )
 
     def _broadcast_global_var_sync(self, room_id: str) -> None:
@@ -2229,20 +2411,11 @@ class NetSyncServer:
 
         # Send NV syncs via ROUTER unicast for reliable delivery
         if applied_globals:
-            vars_payload = []
             with self._rooms_lock:
-                for name in applied_globals:
-                    d = self.global_variables[room_id][name]
-                    vars_payload.append(
-                        {
-                            "name": name,
-                            "value": d["value"],
-                            "lastWriterClientNo": d["lastWriterClientNo"],
-                        }
-                    )
-            msg = binary_serializer.serialize_global_var_sync(
-                {"variables": vars_payload}
-            )
+                room_globals = self.global_variables[room_id]
+                msg = binary_serializer.serialize_global_var_sync_from_store(
+                    {name: room_globals[name] for name in applied_globals}
+                )
             self._send_ctrl_to_room_via_router(room_id, msg)
 
         if applied_client_nos:
@@ -2270,7 +2443,7 @@ class NetSyncServer:
                 return
 
             # Collect mappings only for clients still connected in the room
-            mappings = []
+            mappings: list[tuple[int, str, bool]] = []
             room_clients = self.rooms.get(room_id, {})
             for device_id, client_no in self.room_device_id_to_client_no[
                 room_id
@@ -2282,19 +2455,30 @@ class NetSyncServer:
                 client_data = room_clients[device_id]
                 is_stealth = client_data.get("is_stealth", False)
                 mappings.append((client_no, device_id, is_stealth))
+            cached = self.room_id_mapping_cache.get(room_id)
 
-            if mappings:
-                # Serialize and broadcast the mappings with server version
-                server_version = binary_serializer.parse_version(get_version())
-                message_bytes = binary_serializer.serialize_device_id_mapping(
-                    mappings, server_version
-                )
-                # Send via ROUTER unicast (lock is held, but _send_ctrl_to_room_via_router
-                # will acquire the lock again - RLock allows this)
-                self._send_ctrl_to_room_via_router(room_id, message_bytes)
-                logger.info(
-                    f"Broadcasted {len(mappings)} ID mappings to room {room_id} via ROUTER"
-                )
+        if not mappings:
+            return
+
+        # Serialize and send outside the lock. Reconnects re-send an unchanged
+        # mapping set; reuse its frame instead of re-serializing it.
+        if cached is not None and cached[0] == mappings:
+            message_bytes = cached[1]
+        else:
+            # Serialize the mappings with server version
+            server_version = binary_serializer.parse_version(get_version())
+            message_bytes = binary_serializer.serialize_device_id_mapping(
+                mappings, server_version
+            )
+            # Only the periodic thread broadcasts mappings and removes rooms, so
+            # the cache cannot outlive its room here.
+            self.room_id_mapping_cache[room_id] = (mappings, message_bytes)
+        self._send_ctrl_to_room_via_router(room_id, message_bytes)
+        logger.info(
+            "Broadcasted {} ID mappings to room {} via ROUTER",
+            len(mappings),
+            room_id,
+        )
 
     def _flush_debounced_id_mapping_broadcasts(self, current_time: float) -> None:
         """Flush ID mapping broadcasts that have been debounced long enough."""
@@ -2359,24 +2543,20 @@ class NetSyncServer:
 
                 # Log status periodically
                 if current_time - last_log >= self.STATUS_LOG_INTERVAL:
-                    # Count normal and stealth clients separately
-                    # Take snapshot under lock to avoid RuntimeError from concurrent mutation
+                    # Count normal and stealth clients separately. Counting
+                    # directly under the lock avoids copying every room's
+                    # client list just to take a census.
                     with self._rooms_lock:
-                        rooms_snapshot = {
-                            rid: list(clients.values())
-                            for rid, clients in self.rooms.items()
-                        }
+                        total_clients = 0
+                        stealth_clients = 0
+                        for clients in self.rooms.values():
+                            total_clients += len(clients)
+                            for client in clients.values():
+                                if client.get("is_stealth", False):
+                                    stealth_clients += 1
                         total_device_ids = len(self.device_id_last_seen)
                         num_rooms = len(self.rooms)
-
-                    normal_clients = 0
-                    stealth_clients = 0
-                    for clients in rooms_snapshot.values():
-                        for client in clients:
-                            if client.get("is_stealth", False):
-                                stealth_clients += 1
-                            else:
-                                normal_clients += 1
+                    normal_clients = total_clients - stealth_clients
 
                     logger.info(
                         f"Status: {num_rooms} rooms, {normal_clients} normal clients, "
@@ -2385,18 +2565,42 @@ class NetSyncServer:
                     )
                     last_log = current_time
 
-                time.sleep(self.MAIN_LOOP_SLEEP)  # 50Hz loop for better responsiveness
+                # Sleep until the next scheduled event instead of polling at a
+                # fixed rate; active rooms keep the MAIN_LOOP_SLEEP cadence.
+                next_deadline = min(
+                    last_broadcast_check + self.BROADCAST_CHECK_INTERVAL,
+                    last_cleanup + self.CLEANUP_INTERVAL,
+                    last_device_id_cleanup + DEVICE_ID_CLEANUP_INTERVAL,
+                    last_log + self.STATUS_LOG_INTERVAL,
+                )
+                time.sleep(self._periodic_sleep_time(next_deadline, current_time))
 
             except Exception as e:
                 logger.error(f"Error in periodic loop: {e}")
 
         logger.info("Periodic loop ended")
 
+    def _periodic_sleep_time(self, next_deadline: float, current_time: float) -> float:
+        """Seconds the periodic loop may sleep before its next scheduled event.
+
+        Dirty rooms and pending ID mapping broadcasts cap the wait at
+        MAIN_LOOP_SLEEP so their updates are not delayed.
+        """
+        with self._rooms_lock:
+            busy = any(self.room_dirty_flags.values()) or any(
+                self.room_id_mapping_dirty.values()
+            )
+        if busy:
+            next_deadline = min(next_deadline, current_time + self.MAIN_LOOP_SLEEP)
+        return max(0.0, next_deadline - time.monotonic())
+
     def _adaptive_broadcast_all_rooms(self, current_time: float) -> None:
         """Broadcast room state with adaptive rates based on activity"""
         rooms_to_broadcast: list[
             tuple[str, list[tuple[int, float, dict[str, Any] | None, bytes]]]
         ] = []
+        rooms_to_rebroadcast: list[tuple[str, tuple[int, bytes]]] = []
+        body_cache_get = self.client_transform_body_cache.get
 
         with self._rooms_lock:
             for room_id, clients in self.rooms.items():
@@ -2422,32 +2626,50 @@ class NetSyncServer:
                     if time_since_broadcast >= self.idle_broadcast_interval:
                         should_broadcast = True
 
-                if should_broadcast:
-                    client_snapshot = []
-                    for client_data in clients.values():
-                        if client_data.get("is_stealth", False):
-                            continue
-                        client_no = client_data.get("client_no", 0)
-                        transform_data = client_data.get("transform_data")
-                        if transform_data is None:
-                            continue
-                        pose_time = client_data.get("last_update", 0.0)
-                        body_bytes = self.client_transform_body_cache.get(
-                            client_no, b""
-                        )
-                        if not body_bytes:
-                            continue
-                        client_snapshot.append(
-                            (client_no, pose_time, transform_data, body_bytes)
-                        )
-                    rooms_to_broadcast.append((room_id, client_snapshot))
-                    self.room_dirty_flags[room_id] = False  # Clear dirty flag
-                    self.room_last_broadcast[room_id] = current_time
-                else:
+                if not should_broadcast:
                     self._increment_stat("skipped_broadcasts")
+                    continue
+
+                # Nothing changed since an idle room's last broadcast, so its
+                # serialized client entries can be sent again as they are.
+                cached_section = (
+                    None if is_dirty else self.room_pose_section_cache.get(room_id)
+                )
+                if cached_section is not None:
+                    rooms_to_rebroadcast.append((room_id, cached_section))
+                    self.room_last_broadcast[room_id] = current_time
+                    continue
+
+                client_snapshot: list[
+                    tuple[int, float, dict[str, Any] | None, bytes]
+                ] = []
+                append = client_snapshot.append
+                for client_data in clients.values():
+                    if client_data.get("is_stealth", False):
+                        continue
+                    transform_data = client_data.get("transform_data")
+                    if transform_data is None:
+                        continue
+                    client_no = client_data.get("client_no", 0)
+                    body_bytes = body_cache_get(client_no)
+                    if not body_bytes:
+                        continue
+                    append(
+                        (
+                            client_no,
+                            client_data.get("last_update", 0.0),
+                            transform_data,
+                            body_bytes,
+                        )
+                    )
+                rooms_to_broadcast.append((room_id, client_snapshot))
+                self.room_dirty_flags[room_id] = False  # Clear dirty flag
+                self.room_last_broadcast[room_id] = current_time
 
         for room_id, client_snapshot in rooms_to_broadcast:
             self._broadcast_room(room_id, client_snapshot)
+        for room_id, cached_section in rooms_to_rebroadcast:
+            self._rebroadcast_room(room_id, cached_section)
 
         # Broadcast object states for dirty rooms
         object_rooms_to_broadcast: list[tuple[str, list[dict[str, Any]]]] = []
@@ -2511,42 +2733,95 @@ class NetSyncServer:
         client_snapshot: list[tuple[int, float, dict[str, Any] | None, bytes]],
     ) -> None:
         """Broadcast a specific room's state from a snapshot."""
-        message_bytes = self._serialize_room_transform(room_id, client_snapshot)
-        if not message_bytes:
-            return
-
-        topic_bytes = room_id.encode("utf-8")
-        self._enqueue_pub_latest(topic_bytes, message_bytes)
+        section = self._serialize_room_pose_clients(client_snapshot)
+        # Only the periodic thread broadcasts and removes rooms, so the cache
+        # cannot outlive its room here.
+        self.room_pose_section_cache[room_id] = section
+        self._rebroadcast_room(room_id, section)
+
+    def _rebroadcast_room(self, room_id: str, section: tuple[int, bytes]) -> None:
+        """Broadcast already serialized client entries under a fresh header."""
+        count, client_bytes = section
+        message_bytes = self._frame_room_pose(room_id, count, client_bytes)
+        self._enqueue_pub_latest(self._room_topic(room_id), message_bytes)
 
     def _serialize_room_transform(
         self,
         room_id: str,
         client_snapshot: list[tuple[int, float, dict[str, Any] | None, bytes]],
     ) -> bytes | None:
-        buffer = bytearray()
-        buffer.append(binary_serializer.MSG_ROOM_POSE)
-        buffer.append(binary_serializer.PROTOCOL_VERSION)
-        binary_serializer._pack_string(buffer, room_id)
-        buffer.extend(struct.pack("<d", time.monotonic()))
-        count_offset = len(buffer)
-        buffer.extend(b"\x00\x00")
-
+        count, client_bytes = self._serialize_room_pose_clients(client_snapshot)
+        return self._frame_room_pose(room_id, count, client_bytes)
+
+    def _frame_room_pose(self, room_id: str, count: int, client_bytes: bytes) -> bytes:
+        """Prefix serialized client entries with the MSG_ROOM_POSE header."""
+        header = bytearray()
+        header.append(binary_serializer.MSG_ROOM_POSE)
+        header.append(binary_serializer.PROTOCOL_VERSION)
+        binary_serializer._pack_string(header, room_id)
+        header.extend(struct.pack("<dH", time.monotonic(), count))
+        # join sizes the frame once and copies the client entries only once
+        return b"".join((header, client_bytes))
+
+    def _serialize_room_pose_clients(
+        self,
+        client_snapshot: list[tuple[int, float, dict[str, Any] | None, bytes]],
+    ) -> tuple[int, bytes]:
+        """Serialize the client entries of a MSG_ROOM_POSE and return their count."""
+        # Collect the pieces and join once, so the result is allocated at its
+        # final size instead of growing a bytearray and copying it out.
+        parts: list[bytes] = []
         count = 0
+        pack_header = _ROOM_POSE_CLIENT_HEADER.pack
+        append = parts.append
         for client_no, pose_time, transform_data, body_bytes in client_snapshot:
             if body_bytes:
-                buffer.extend(struct.pack("<H", client_no))
-                buffer.extend(struct.pack("<d", pose_time))
-                buffer.extend(body_bytes)
+                append(pack_header(client_no, pose_time))
+                append(body_bytes)
                 count += 1
                 continue
 
             if transform_data:
                 transform_data["poseTime"] = pose_time
+                buffer = bytearray()
                 binary_serializer._serialize_client_data_short(buffer, transform_data)
+                append(bytes(buffer))
                 count += 1
 
-        struct.pack_into("<H", buffer, count_offset, count)
-        return bytes(buffer)
+        return count, b"".join(parts)
+
+    def _room_scoped_maps(self) -> tuple[dict[str, Any], ...]:
+        """Return every dict keyed by room ID, for removing a room in one pass."""
+        return (
+            self.rooms,
+            self.room_dirty_flags,
+            self.room_last_broadcast,
+            self.room_client_no_counters,
+            self.room_device_id_to_client_no,
+            self.room_client_no_to_device_id,
+            # ID mapping debounce tracking
+            self.room_id_mapping_dirty,
+            self.room_last_id_mapping_broadcast,
+            # Empty room tracking
+            self.room_empty_since,
+            # NV-related structures
+            self.global_variables,
+            self.client_variables,
+            self.pending_global_nv,
+            self.pending_client_nv,
+            self.nv_write_seq,
+            self.room_last_nv_flush,
+            self.nv_monitor_window,
+            # Object sync structures
+            self.room_objects,
+            self.room_object_dirty,
+            self._room_last_object_broadcast,
+            # Serialized caches
+            self.room_topic_bytes,
+            self.room_pose_section_cache,
+            self.global_var_sync_cache,
+            self.room_id_mapping_cache,
+        )
 
     def _cleanup_clients(self, current_time: float) -> None:
         """Clean up disconnected clients with atomic operations to prevent memory leaks"""
@@ -2642,52 +2917,8 @@ class NetSyncServer:
             for room_id in rooms_to_remove:
                 try:
                     # Delete from all room-related data structures
-                    if room_id in self.rooms:
-                        del self.rooms[room_id]
-                    if room_id in self.room_dirty_flags:
-                        del self.room_dirty_flags[room_id]
-                    if room_id in self.room_last_broadcast:
-                        del self.room_last_broadcast[room_id]
-                    if room_id in self.room_client_no_counters:
-                        del self.room_client_no_counters[room_id]
-                    if room_id in self.room_device_id_to_client_no:
-                        del self.room_device_id_to_client_no[room_id]
-                    if room_id in self.room_client_no_to_device_id:
-                        del self.room_client_no_to_device_id[room_id]
-
-                    # Clean up ID mapping debounce tracking
-                    if room_id in self.room_id_mapping_dirty:
-                        del self.room_id_mapping_dirty[room_id]
-                    if room_id in self.room_last_id_mapping_broadcast:
-                        del self.room_last_id_mapping_broadcast[room_id]
-
-                    # Clean up empty room tracking
-                    if room_id in self.room_empty_since:
-                        del self.room_empty_since[room_id]
-
-                    # Clean up NV-related structures
-                    if room_id in self.global_variables:
-                        del self.global_variables[room_id]
-                    if room_id in self.client_variables:
-                        del self.client_variables[room_id]
-                    if room_id in self.pending_global_nv:
-                        del self.pending_global_nv[room_id]
-                    if room_id in self.pending_client_nv:
-                        del self.pending_client_nv[room_id]
-                    if room_id in self.nv_write_seq:
-                        del self.nv_write_seq[room_id]
-                    if room_id in self.room_last_nv_flush:
-                        del self.room_last_nv_flush[room_id]
-                    if room_id in self.nv_monitor_window:
-                        del self.nv_monitor_window[room_id]
-
-                    # Clean up object sync structures
-                    if room_id in self.room_objects:
-                        del self.room_objects[room_id]
-                    if room_id in self.room_object_dirty:
-                        del self.room_object_dirty[room_id]
-                    if room_id in self._room_last_object_broadcast:
-                        del self._room_last_object_broadcast[room_id]
+                    for room_map in self._room_scoped_maps():
+                        room_map.pop(room_id, None)
 
                     logger.info(f"Removed empty room: {room_id}")
 
@@ -2790,6 +3021,8 @@ class NetSyncServer:
         """Start server discovery service to respond to client requests"""
         # Probe for existing servers before binding
         self._probe_existing_discovery_server()
+        # Discard a wakeup left over from a previous stop
+        self._drain_discovery_wake(self._udp_discovery_wake_r)
 
         # Start UDP server discovery
         try:
@@ -2800,9 +3033,6 @@ class NetSyncServer:
                 socket.SOL_SOCKET, socket.SO_REUSEADDR, 1
             )
             self.server_discovery_socket.bind(("", self.server_discovery_port))
-            self.server_discovery_socket.settimeout(
-                1.0
-            )  # Timeout for graceful shutdown
 
             self.server_discovery_running = True
             self.server_discovery_thread = threading.Thread(
@@ -2832,6 +3062,7 @@ class NetSyncServer:
         """Stop server discovery service"""
         # Stop UDP server discovery
         self.server_discovery_running = False
+        self._wake_discovery_loop(self._udp_discovery_wake_w)
 
         udp_socket = self.server_discovery_socket
         if udp_socket is not None:
@@ -2854,18 +3085,26 @@ class NetSyncServer:
         # STYLY-NETSYNC3|controlPort|transformPort|pubPort|restApiPort|serverName
         response = self._build_discovery_response()
         response_bytes = response.encode("utf-8")
+        request_bytes = discovery.DISCOVERY_REQUEST.encode("utf-8")
         udp_socket = self.server_discovery_socket
         if udp_socket is None:
             return
+        selector = self._discovery_selector(udp_socket, self._udp_discovery_wake_r)
+
+        # Datagrams are read into one reusable buffer and compared as bytes,
+        # so probe storms cost no per-packet allocation or UTF-8 decode.
+        buffer = bytearray(1024)
+        view = memoryview(buffer)
 
         while self.server_discovery_running:
             try:
                 # Wait for client discovery request
-                data, client_addr = udp_socket.recvfrom(1024)
-                request = data.decode("utf-8")
+                if not self._wait_for_discovery(selector, udp_socket):
+                    continue
+                nbytes, client_addr = udp_socket.recvfrom_into(buffer)
 
                 # Validate request format
-                if request == discovery.DISCOVERY_REQUEST:
+                if view[:nbytes] == request_bytes:
                     # Send response back to requesting client
                     udp_socket.sendto(response_bytes, client_addr)
                     logger.debug(
@@ -2880,9 +3119,52 @@ class NetSyncServer:
                     self.server_discovery_running
                 ):  # Only log if we're still supposed to be running
                     logger.error(f"UDP discovery service error: {e}")
+        selector.close()
+
+    def _discovery_selector(
+        self, sock: socket.socket, wake_r: socket.socket
+    ) -> selectors.BaseSelector:
+        """Return a selector watching ``sock`` and its loop's wake socket."""
+        selector = selectors.DefaultSelector()
+        selector.register(sock, selectors.EVENT_READ)
+        selector.register(wake_r, selectors.EVENT_READ)
+        return selector
+
+    def _wait_for_discovery(
+        self, selector: selectors.BaseSelector, sock: socket.socket
+    ) -> bool:
+        """Block until ``sock`` is readable (True) or a stop wakeup arrives.
+
+        A consumed wakeup is drained so a loop that is still running blocks
+        again instead of spinning on a readable wake socket.
+        """
+        ready = False
+        for key, _ in selector.select():
+            if key.fileobj is sock:
+                ready = True
+            else:
+                self._drain_discovery_wake(cast(socket.socket, key.fileobj))
+        return ready
+
+    def _drain_discovery_wake(self, wake_r: socket.socket) -> None:
+        """Discard pending wakeup bytes from a discovery wake socket."""
+        try:
+            while wake_r.recv(4096):
+                pass
+        except OSError:
+            pass
+
+    def _wake_discovery_loop(self, wake_w: socket.socket) -> None:
+        """Interrupt a discovery loop's blocking select."""
+        try:
+            wake_w.send(b"\0")
+        except OSError:
+            # Either a wakeup is already pending or the pair is closed
+            pass
 
     def _start_tcp_server_discovery(self) -> None:
         """Start TCP-based server discovery service"""
+        self._drain_discovery_wake(self._tcp_discovery_wake_r)
         try:
             self.tcp_server_discovery_socket = socket.socket(
                 socket.AF_INET, socket.SOCK_STREAM
@@ -2892,9 +3174,6 @@ class NetSyncServer:
             )
             self.tcp_server_discovery_socket.bind(("", self.server_discovery_port))
             self.tcp_server_discovery_socket.listen(5)
-            self.tcp_server_discovery_socket.settimeout(
-                1.0
-            )  # Timeout for graceful shutdown
 
             self.tcp_server_discovery_running = True
             self.tcp_server_discovery_thread = threading.Thread(
@@ -2911,6 +3190,7 @@ class NetSyncServer:
     def _stop_tcp_server_discovery(self) -> None:
         """Stop TCP-based server discovery service"""
         self.tcp_server_discovery_running = False
+        self._wake_discovery_loop(self._tcp_discovery_wake_w)
 
         tcp_socket = self.tcp_server_discovery_socket
         if tcp_socket is not None:
@@ -2931,10 +3211,13 @@ class NetSyncServer:
         tcp_socket = self.tcp_server_discovery_socket
         if tcp_socket is None:
             return
+        selector = self._discovery_selector(tcp_socket, self._tcp_discovery_wake_r)
 
         while self.tcp_server_discovery_running:
             try:
                 # Accept incoming connection
+                if not self._wait_for_discovery(selector, tcp_socket):
+                    continue
                 client_socket, client_addr = tcp_socket.accept()
                 client_socket.settimeout(2.0)  # Timeout for client operations
 
@@ -2964,6 +3247,7 @@ class NetSyncServer:
                     self.tcp_server_discovery_running
                 ):  # Only log if we're still supposed to be running
                     logger.error(f"TCP discovery service error: {e}")
+        selector.close()
 
 
 def display_logo() -> None:
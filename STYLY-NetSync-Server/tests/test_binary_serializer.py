@@ -1150,6 +1150,45 @@ class TestNetworkVariableSetSerialization:
         assert result == data
 
 
+class TestVariableSyncFromStore:
+    """Tests for serializing variable syncs directly from the server store."""
+
+    STORE = {
+        "score": {"value": "10", "timestamp": 1.0, "lastWriterClientNo": 3},
+        "mode": {"value": "x" * 2000, "timestamp": 2.0, "lastWriterClientNo": 4},
+    }
+
+    def test_global_sync_matches_list_based_serializer(self) -> None:
+        """Store-based global sync produces the same bytes as the list form."""
+        variables = [
+            {
+                "name": name,
+                "value": var["value"],
+                "lastWriterClientNo": var["lastWriterClientNo"],
+            }
+            for name, var in self.STORE.items()
+        ]
+
+        assert binary_serializer.serialize_global_var_sync_from_store(
+            self.STORE
+        ) == binary_serializer.serialize_global_var_sync({"variables": variables})
+
+    def test_client_sync_roundtrip(self) -> None:
+        """Store-based client sync decodes to each client's variables."""
+        serialized = binary_serializer.serialize_client_var_sync_from_store(
+            [(1, self.STORE), (2, {})]
+        )
+        msg_type, result, _ = binary_serializer.deserialize(serialized)
+
+        assert msg_type == binary_serializer.MSG_CLIENT_VAR_SYNC
+        assert result is not None
+        client_vars = result["clientVariables"]
+        assert client_vars["2"] == []
+        assert [v["name"] for v in client_vars["1"]] == ["score", "mode"]
+        assert client_vars["1"][0]["lastWriterClientNo"] == 3
+        assert len(client_vars["1"][1]["value"]) == 1024
+
+
 class TestClientVariableClearSerialization:
     """Tests for client variable clear serialization/deserialization."""
 
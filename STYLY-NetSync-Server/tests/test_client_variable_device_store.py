@@ -172,6 +172,23 @@ class TestServerClientVariableDeviceStore:
         assert "device-a" not in server.room_device_id_to_client_no["room1"]
         assert 7 not in server.room_client_no_to_device_id["room1"]
 
+    def test_expired_device_cleanup_spans_rooms_and_keeps_live_devices(
+        self, server: NetSyncServer
+    ) -> None:
+        _map_device(server, "room1", "device-a", 7)
+        _map_device(server, "room2", "device-a", 3)
+        _map_device(server, "room2", "device-b", 4)
+        server.device_id_last_seen["device-a"] = (
+            time.monotonic() - server.DEVICE_ID_EXPIRY_TIME - 1.0
+        )
+
+        server._cleanup_expired_device_id_mappings(time.monotonic())
+
+        assert "device-a" not in server.device_id_last_seen
+        assert server.room_device_id_to_client_no["room1"] == {}
+        assert server.room_device_id_to_client_no["room2"] == {"device-b": 4}
+        assert server.room_client_no_to_device_id["room2"] == {4: "device-b"}
+
     def test_reusable_client_no_cleanup_removes_client_variables(
         self, server: NetSyncServer
     ) -> None:
@@ -473,3 +490,47 @@ class TestPythonClientClientVariableSnapshots:
         manager._clear_local_client_variables(7)
 
         assert manager.get_all_client_variables(7) == {}
+
+    def test_coalesced_nv_events_deliver_net_change_per_variable(self) -> None:
+        manager = net_sync_manager(auto_dispatch=False, coalesce_nv_events=True)
+        events: list[tuple[int, str, str | None, str | None]] = []
+        manager.on_client_variable_changed.add_listener(
+            lambda client_no, name, old_value, new_value: events.append(
+                (client_no, name, old_value, new_value)
+            )
+        )
+
+        for value in ("1", "2", "3"):
+            manager._process_client_var_sync(
+                {
+                    "clientVariables": {
+                        "7": [
+                            {"name": "pos", "value": value},
+                            {"name": "k", "value": "x"},
+                        ]
+                    }
+                }
+            )
+
+        assert manager.dispatch_pending_events() == 2
+        assert events == [(7, "k", None, "x"), (7, "pos", None, "3")]
+
+    def test_coalesced_nv_events_drop_changes_that_cancel_out(self) -> None:
+        manager = net_sync_manager(auto_dispatch=False, coalesce_nv_events=True)
+        events: list[tuple[str, str | None, str | None]] = []
+        manager.on_global_variable_changed.add_listener(
+            lambda name, old_value, new_value: events.append(
+                (name, old_value, new_value)
+            )
+        )
+        manager._global_variables["mode"] = "a"
+
+        manager._process_global_var_sync(
+            {"variables": [{"name": "mode", "value": "b"}]}
+        )
+        manager._process_global_var_sync(
+            {"variables": [{"name": "mode", "value": "a"}]}
+        )
+
+        assert manager.dispatch_pending_events() == 0
+        assert events == []
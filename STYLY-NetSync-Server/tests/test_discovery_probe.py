@@ -5,6 +5,7 @@ from __future__ import annotations
 import io
 import socket
 import threading
+import time
 from dataclasses import replace
 from unittest.mock import patch
 
@@ -118,3 +119,94 @@ class TestDiscoveryProbe:
         with patch("socket.socket", side_effect=OSError("mock error")):
             # Should not raise
             server._probe_existing_discovery_server()
+
+
+class TestUdpDiscoveryLoop:
+    """Tests for _server_discovery_loop."""
+
+    def test_answers_exact_request_and_ignores_other_datagrams(self) -> None:
+        """Only the exact DISCOVER payload gets the discovery response."""
+        server = NetSyncServer(
+            dealer_port=5555,
+            transform_port=5557,
+            pub_port=5556,
+            server_name="LoopServer",
+            enable_server_discovery=False,
+        )
+        udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp_socket.bind(("127.0.0.1", 0))
+        server.server_discovery_socket = udp_socket
+        server.server_discovery_running = True
+        loop = threading.Thread(target=server._server_discovery_loop, daemon=True)
+        loop.start()
+
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        client.settimeout(2.0)
+        try:
+            address = udp_socket.getsockname()
+            client.sendto(b"STYLY-NETSYNC-DISCOVERX", address)
+            client.sendto(b"\xff\xfe", address)
+            client.sendto(b"STYLY-NETSYNC-DISCOVER", address)
+
+            data, _ = client.recvfrom(1024)
+            assert data == server._build_discovery_response().encode("utf-8")
+
+            client.settimeout(0.3)
+            try:
+                extra, _ = client.recvfrom(1024)
+            except TimeoutError:
+                extra = b""
+            assert extra == b""
+        finally:
+            server.server_discovery_running = False
+            server._wake_discovery_loop(server._udp_discovery_wake_w)
+            loop.join(timeout=2)
+            assert not loop.is_alive()
+            client.close()
+            udp_socket.close()
+
+    def test_spurious_wakeup_is_drained_and_tcp_stop_leaves_udp_running(
+        self,
+    ) -> None:
+        """A wakeup while still running is consumed; the loop keeps answering."""
+        server = NetSyncServer(
+            dealer_port=5555,
+            transform_port=5557,
+            pub_port=5556,
+            server_name="LoopServer",
+            enable_server_discovery=False,
+        )
+        udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp_socket.bind(("127.0.0.1", 0))
+        server.server_discovery_socket = udp_socket
+        server.server_discovery_running = True
+        loop = threading.Thread(target=server._server_discovery_loop, daemon=True)
+        loop.start()
+
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        client.settimeout(2.0)
+        try:
+            server._stop_tcp_server_discovery()
+            assert server.server_discovery_running
+
+            server._wake_discovery_loop(server._udp_discovery_wake_w)
+            deadline = time.monotonic() + 2.0
+            drained = False
+            while not drained and time.monotonic() < deadline:
+                try:
+                    server._udp_discovery_wake_r.recv(1, socket.MSG_PEEK)
+                    time.sleep(0.01)
+                except BlockingIOError:
+                    drained = True
+            assert drained
+
+            client.sendto(b"STYLY-NETSYNC-DISCOVER", udp_socket.getsockname())
+            data, _ = client.recvfrom(1024)
+            assert data == server._build_discovery_response().encode("utf-8")
+        finally:
+            server.server_discovery_running = False
+            server._wake_discovery_loop(server._udp_discovery_wake_w)
+            loop.join(timeout=2)
+            assert not loop.is_alive()
+            client.close()
+            udp_socket.close()
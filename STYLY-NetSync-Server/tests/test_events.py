@@ -0,0 +1,84 @@
+"""Tests for the client-side EventHandler."""
+
+import logging
+
+from styly_netsync.events import EventHandler
+
+
+def test_unsubscribe_during_invoke_does_not_skip_other_listeners() -> None:
+    handler = EventHandler()
+    calls: list[str] = []
+
+    def first(_value: int) -> None:
+        calls.append("first")
+        unsubscribe_first()
+
+    def second(_value: int) -> None:
+        calls.append("second")
+
+    unsubscribe_first = handler.add_listener(first)
+    handler.add_listener(second)
+
+    handler.invoke(1)
+    handler.invoke(2)
+
+    assert calls == ["first", "second", "second"]
+
+
+def test_listener_added_during_invoke_fires_from_next_invoke() -> None:
+    handler = EventHandler()
+    calls: list[str] = []
+
+    def late(_value: int) -> None:
+        calls.append("late")
+
+    def adder(_value: int) -> None:
+        calls.append("adder")
+        handler.add_listener(late)
+        handler.remove_listener(adder)
+
+    handler.add_listener(adder)
+
+    handler.invoke(1)
+    handler.invoke(2)
+
+    assert calls == ["adder", "late"]
+
+
+def test_invoke_uses_snapshot_taken_at_start() -> None:
+    handler = EventHandler()
+    calls: list[str] = []
+
+    def second(_value: int) -> None:
+        calls.append("second")
+
+    def first(_value: int) -> None:
+        calls.append("first")
+        handler.remove_listener(second)
+
+    handler.add_listener(first)
+    handler.add_listener(second)
+
+    handler.invoke(1)
+    handler.invoke(2)
+
+    # The listener removed mid-invoke still fires for the in-flight event, as
+    # with the previous per-invoke list copy, and is gone afterwards.
+    assert calls == ["first", "second", "first"]
+
+
+def test_failing_listener_is_logged_and_others_still_run(caplog) -> None:
+    handler = EventHandler()
+    calls: list[int] = []
+
+    def broken(_value: int) -> None:
+        raise RuntimeError("boom")
+
+    handler.add_listener(broken)
+    handler.add_listener(calls.append)
+
+    with caplog.at_level(logging.ERROR, logger="styly_netsync.events"):
+        handler.invoke(1)
+
+    assert calls == [1]
+    assert any("Error in event listener" in r.message for r in caplog.records)
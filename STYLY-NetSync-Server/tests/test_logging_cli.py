@@ -1,4 +1,5 @@
 import logging
+import os
 import sys
 import time
 from datetime import datetime, timedelta
@@ -294,6 +295,117 @@ def test_rotation_uses_cached_start_time(monkeypatch, tmp_path):
     assert logging_utils.get_last_rotation_time() == pytest.approx(after_threshold)
 
 
+def test_rotation_size_check_throttles_stat(monkeypatch, tmp_path):
+    log_file = tmp_path / "netsync-server.log"
+    log_file.write_text("", encoding="utf-8")
+    monkeypatch.setattr(logging_utils, "get_ctime", lambda path: time.time())
+    monkeypatch.setattr(logging_utils, "LOG_ROTATION_SIZE_BYTES", 1600)
+
+    stat_calls: list[Path] = []
+    original_stat = Path.stat
+
+    def counting_stat(self, *args, **kwargs):
+        if self == log_file:
+            stat_calls.append(self)
+        return original_stat(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", counting_stat)
+
+    class Message(str):
+        record = {"time": datetime.now()}
+
+    line = Message("x" * 10)
+    for _ in range(5):
+        assert logging_utils._default_rotation_condition(line, log_file) is False
+    assert len(stat_calls) == 1
+
+    # 1600 // 16 = 100 unchecked bytes forces the next stat()
+    for _ in range(10):
+        logging_utils._default_rotation_condition(line, log_file)
+    assert len(stat_calls) == 2
+
+
+def test_rotation_size_check_interval_forces_stat(monkeypatch, tmp_path):
+    log_file = tmp_path / "netsync-server.log"
+    log_file.write_text("", encoding="utf-8")
+    monkeypatch.setattr(logging_utils, "get_ctime", lambda path: time.time())
+    clock = [100.0]
+    monkeypatch.setattr(logging_utils, "monotonic", lambda: clock[0])
+
+    stat_calls: list[Path] = []
+    original_stat = Path.stat
+
+    def counting_stat(self, *args, **kwargs):
+        if self == log_file:
+            stat_calls.append(self)
+        return original_stat(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", counting_stat)
+    message = _make_message(time.time())
+
+    for _ in range(3):
+        logging_utils._default_rotation_condition(message, log_file)
+    assert len(stat_calls) == 1
+
+    clock[0] += logging_utils.LOG_ROTATION_SIZE_CHECK_INTERVAL
+    logging_utils._default_rotation_condition(message, log_file)
+    assert len(stat_calls) == 2
+
+
+def test_rotation_size_check_uses_open_handle(monkeypatch, tmp_path):
+    monkeypatch.setattr(logging_utils, "LOG_ROTATION_SIZE_BYTES", 10)
+
+    def fail_stat(self, *args, **kwargs):
+        raise AssertionError("path stat() should not be used for open handles")
+
+    log_file = tmp_path / "rotate.log"
+    with log_file.open("w", encoding="utf-8") as handle:
+        handle.write("x" * 20)
+        handle.flush()
+        monkeypatch.setattr(Path, "stat", fail_stat)
+        message = _make_message(time.time())
+        assert logging_utils._default_rotation_condition(message, handle) is True
+
+
+def test_retention_policy_keeps_newest_files(monkeypatch, tmp_path):
+    monkeypatch.setattr(logging_utils, "LOG_RETENTION_MAX_FILES", 3)
+    base = time.time() - 1000
+    paths = []
+    for index in range(6):
+        path = tmp_path / f"netsync-server.{index}.log"
+        path.write_text("x", encoding="utf-8")
+        os.utime(path, (base + index, base + index))
+        paths.append(path)
+
+    unrelated = tmp_path / "other.txt"
+    unrelated.write_text("keep", encoding="utf-8")
+    os.utime(unrelated, (base - 10, base - 10))
+
+    logging_utils._default_retention_policy([str(p) for p in reversed(paths)])
+
+    assert sorted(tmp_path.iterdir()) == sorted([*paths[3:], unrelated])
+
+
+def test_retention_policy_drops_page_cache_for_rotated_files(monkeypatch, tmp_path):
+    advised: list[int] = []
+    monkeypatch.setattr(
+        logging_utils.os,
+        "posix_fadvise",
+        lambda fd, offset, length, advice: advised.append(advice),
+        raising=False,
+    )
+    monkeypatch.setattr(logging_utils.os, "POSIX_FADV_DONTNEED", 4, raising=False)
+    paths = []
+    for index in range(2):
+        path = tmp_path / f"netsync-server.{index}.log"
+        path.write_text("x", encoding="utf-8")
+        paths.append(str(path))
+
+    logging_utils._default_retention_policy([*paths, str(tmp_path / "gone.log")])
+
+    assert advised == [4, 4]
+
+
 def test_intercept_handler_redirects_stdlib(monkeypatch):
     dummy_logger = DummyLogger()
     monkeypatch.setattr(logging_utils, "logger", dummy_logger)
@@ -315,6 +427,84 @@ def test_intercept_handler_redirects_stdlib(monkeypatch):
     assert dummy_logger.logged[-1]["level"] == "WARNING"
 
 
+def test_intercept_handler_caches_depth_per_call_site(monkeypatch):
+    dummy_logger = DummyLogger()
+    monkeypatch.setattr(logging_utils, "logger", dummy_logger)
+    # A cached depth for the call site must be used as-is, without a frame walk.
+    monkeypatch.setattr(logging_utils, "_intercept_depth_cache", {(__file__, 42): 7})
+
+    handler = logging_utils.InterceptHandler()
+    for lineno in (42, 42, 43):
+        record = logging.LogRecord(
+            name="dummy",
+            level=logging.INFO,
+            pathname=__file__,
+            lineno=lineno,
+            msg="hello",
+            args=(),
+            exc_info=None,
+        )
+        handler.emit(record)
+
+    depths = [entry["depth"] for entry in dummy_logger.logged]
+    assert depths[:2] == [7, 7]
+    assert logging_utils._intercept_depth_cache[(__file__, 43)] == depths[2]
+
+
+def test_intercept_handler_memoizes_level_lookup(monkeypatch):
+    lookups: list[str] = []
+
+    class CountingLogger(DummyLogger):
+        def level(self, name):
+            lookups.append(name)
+            if name == "CUSTOM":
+                raise ValueError(name)
+            return super().level(name)
+
+    dummy_logger = CountingLogger()
+    monkeypatch.setattr(logging_utils, "logger", dummy_logger)
+    monkeypatch.setattr(logging_utils, "_intercept_level_cache", {})
+
+    handler = logging_utils.InterceptHandler()
+    for levelno, levelname in [(30, "WARNING"), (30, "WARNING"), (25, "CUSTOM")] * 2:
+        record = logging.LogRecord(
+            name="dummy",
+            level=levelno,
+            pathname=__file__,
+            lineno=1,
+            msg="hello",
+            args=(),
+            exc_info=None,
+        )
+        record.levelname = levelname
+        handler.emit(record)
+
+    assert lookups == ["WARNING", "CUSTOM"]
+    levels = [entry["level"] for entry in dummy_logger.logged]
+    assert levels == ["WARNING", "WARNING", 25, "WARNING", "WARNING", 25]
+
+
+def test_intercept_handler_attributes_original_caller(monkeypatch):
+    from loguru import logger as loguru_logger
+
+    monkeypatch.setattr(logging_utils, "_intercept_depth_cache", {})
+    records: list[dict] = []
+    sink_id = loguru_logger.add(lambda msg: records.append(msg.record), level="DEBUG")
+    std_logger = logging.getLogger("intercept-caller-test")
+    std_logger.propagate = False
+    std_logger.setLevel(logging.DEBUG)
+    std_logger.addHandler(logging_utils.InterceptHandler())
+    try:
+        std_logger.warning("from stdlib")
+    finally:
+        std_logger.handlers.clear()
+        loguru_logger.remove(sink_id)
+
+    assert (
+        records[-1]["function"] == "test_intercept_handler_attributes_original_caller"
+    )
+
+
 def test_configure_logging_console_json(monkeypatch):
     dummy_logger = DummyLogger()
     monkeypatch.setattr(logging_utils, "logger", dummy_logger)
@@ -331,6 +521,19 @@ def test_configure_logging_console_json(monkeypatch):
     assert console_kwargs["level"] == "WARNING"
 
 
+def test_configure_logging_console_text_uses_shared_format(monkeypatch):
+    dummy_logger = DummyLogger()
+    monkeypatch.setattr(logging_utils, "logger", dummy_logger)
+    monkeypatch.setattr(logging, "basicConfig", lambda **_: None)
+    monkeypatch.setattr(logging, "captureWarnings", lambda *_, **__: None)
+
+    logging_utils.configure_logging(log_dir=None)
+
+    console_kwargs = dummy_logger.add_calls[0]["kwargs"]
+    assert console_kwargs["serialize"] is False
+    assert console_kwargs["format"] is logging_utils.CONSOLE_LOG_FORMAT
+
+
 def test_configure_logging_uses_custom_rotation_and_retention(monkeypatch, tmp_path):
     dummy_logger = DummyLogger()
     monkeypatch.setattr(logging_utils, "logger", dummy_logger)
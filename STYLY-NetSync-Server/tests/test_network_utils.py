@@ -0,0 +1,88 @@
+"""Tests for local interface address discovery."""
+
+import socket
+from types import SimpleNamespace
+
+import pytest
+
+from styly_netsync import network_utils
+
+
+@pytest.fixture(autouse=True)
+def _clear_ip_cache():
+    network_utils.invalidate_ip_cache()
+    yield
+    network_utils.invalidate_ip_cache()
+
+
+def _addr(ip: str, family: int = socket.AF_INET) -> SimpleNamespace:
+    return SimpleNamespace(family=family, address=ip)
+
+
+def test_get_local_ip_addresses_skips_virtual_and_loopback(monkeypatch) -> None:
+    interfaces = {
+        "eth0": [_addr("192.168.1.10"), _addr("fe80::1", socket.AF_INET6)],
+        "Docker0": [_addr("172.17.0.1")],
+        "vEthernet1": [_addr("172.18.0.1")],
+        "utun3": [_addr("10.8.0.2")],
+        "lo": [_addr("127.0.0.1")],
+        "en1": [_addr("169.254.3.4"), _addr("10.0.0.5")],
+    }
+    monkeypatch.setattr(network_utils.psutil, "net_if_addrs", lambda: interfaces)
+
+    assert network_utils.get_local_ip_addresses() == ["192.168.1.10", "10.0.0.5"]
+
+
+def test_get_local_ip_addresses_caches_within_ttl(monkeypatch) -> None:
+    calls: list[int] = []
+
+    def fake_net_if_addrs():
+        calls.append(1)
+        return {"eth0": [_addr("192.168.1.10")]}
+
+    clock = [1000.0]
+    monkeypatch.setattr(network_utils.psutil, "net_if_addrs", fake_net_if_addrs)
+    monkeypatch.setattr(network_utils.time, "monotonic", lambda: clock[0])
+
+    first = network_utils.get_local_ip_addresses()
+    first.append("mutated")
+    assert network_utils.get_local_ip_addresses() == ["192.168.1.10"]
+    assert len(calls) == 1
+
+    clock[0] += network_utils.IP_CACHE_TTL
+    network_utils.get_local_ip_addresses()
+    assert len(calls) == 2
+
+    network_utils.invalidate_ip_cache()
+    network_utils.get_local_ip_addresses()
+    assert len(calls) == 3
+
+
+def test_get_local_ip_addresses_does_not_cache_failures(monkeypatch) -> None:
+    def broken():
+        raise OSError("no interfaces")
+
+    monkeypatch.setattr(network_utils.psutil, "net_if_addrs", broken)
+    assert network_utils.get_local_ip_addresses() == []
+
+    monkeypatch.setattr(
+        network_utils.psutil, "net_if_addrs", lambda: {"eth0": [_addr("10.0.0.7")]}
+    )
+    assert network_utils.get_local_ip_addresses() == ["10.0.0.7"]
+
+
+def test_get_local_ip_addresses_returns_partial_result_on_failure(monkeypatch) -> None:
+    class FailingAddresses:
+        def __iter__(self):
+            yield _addr("192.168.1.10")
+            raise OSError("interface vanished")
+
+    interfaces = {"eth0": FailingAddresses()}
+    monkeypatch.setattr(network_utils.psutil, "net_if_addrs", lambda: interfaces)
+
+    assert network_utils.get_local_ip_addresses() == ["192.168.1.10"]
+
+    monkeypatch.setattr(
+        network_utils.psutil, "net_if_addrs", lambda: {"eth0": [_addr("10.0.0.7")]}
+    )
+    assert network_utils.get_local_ip_addresses() == ["10.0.0.7"]
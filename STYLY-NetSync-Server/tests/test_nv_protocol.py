@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import struct
+import zlib
+
 import msgpack
 import pytest
 
+from styly_netsync import nv_sync
 from styly_netsync.nv_sync import (
     DELTA_MESSAGE_TYPE,
     NAME_TABLE_DELTA_MESSAGE_TYPE,
@@ -107,6 +111,14 @@ def test_delete_unknown_returns_none() -> None:
     assert room.collect_delta_payload() is None
 
 
+def test_delete_for_unknown_client_does_not_create_scope() -> None:
+    room = RoomState(room_id="scopes")
+    room.set_client(1, "hp", 10)
+
+    assert room.delete_client(2, "hp") is None
+    assert room.clients_by_no == {1: {1: 10}}
+
+
 @pytest.mark.parametrize("count", [1, 3, 5])
 def test_encode_roundtrip(count: int) -> None:
     room = RoomState(room_id="encode")
@@ -118,3 +130,178 @@ def test_encode_roundtrip(count: int) -> None:
     encoded = RoomState.encode_payload(payload)
     decoded = unpack(encoded)
     assert decoded == payload
+
+
+def test_name_table_entries_survive_trim(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = [0.0]
+    monkeypatch.setattr(nv_sync.time, "monotonic", lambda: clock[0])
+    room = RoomState(room_id="trim")
+    for idx in range(4):
+        room.set_global(f"n{idx}", idx)
+    table = room.name_table
+    crc_before = table.crc32
+
+    clock[0] = 100.0
+    for name in ("n0", "n2", "n3"):
+        table.resolve(name)
+    assert table.trim_stale(stale_after=60.0) == [2]
+
+    assert table.entries() == [(1, "n0"), (3, "n2"), (4, "n3")]
+    assert table.crc32 != crc_before
+    name_id, is_new = table.resolve("n4")
+    assert (name_id, is_new) == (5, True)
+    assert table.entries()[-1] == (5, "n4")
+
+
+def test_incremental_crc_matches_full_recompute() -> None:
+    room = RoomState(room_id="crc")
+    for idx in range(50):
+        room.set_global(f"var{idx}", idx)
+    table = room.name_table
+    incremental = table.crc32
+
+    table._recompute_crc32()
+
+    assert table.crc32 == incremental
+
+
+def test_snapshot_encodes_live_state_without_copying() -> None:
+    room = RoomState(room_id="live")
+    room.set_global("score", 1)
+    room.set_client(3, "hp", 50)
+
+    snapshot = room.build_snapshot_payload()
+    assert snapshot["globals"] is room.globals_by_id
+    assert snapshot["clients"] is room.clients_by_no
+
+    decoded = unpack(RoomState.encode_payload(snapshot))
+    assert decoded["globals"] == {1: 1}
+    assert decoded["clients"] == {3: {2: 50}}
+
+
+def test_encode_payload_reuses_packer_without_leaking_state() -> None:
+    first = {"type": DELTA_MESSAGE_TYPE, "items": [1, 2, 3]}
+    second = {"type": SNAPSHOT_MESSAGE_TYPE, "blob": b"\x00\x01"}
+
+    assert unpack(RoomState.encode_payload(first)) == first
+    assert unpack(RoomState.encode_payload(second)) == second
+    assert nv_sync._get_packer() is nv_sync._get_packer()
+
+
+def test_encode_delta_payload_matches_dict_encoding() -> None:
+    def populate(room: RoomState) -> None:
+        room.set_global("g", {"nested": [1, 2]})
+        room.set_client(4, "c", b"\x01")
+        room.delete_client(4, "c")
+        room.delete_global("g")
+
+    streamed_room = RoomState(room_id="stream")
+    dict_room = RoomState(room_id="stream")
+    populate(streamed_room)
+    populate(dict_room)
+
+    payload = dict_room.collect_delta_payload()
+    assert payload is not None
+    assert streamed_room.encode_delta_payload() == RoomState.encode_payload(payload)
+    assert streamed_room.encode_delta_payload() is None
+
+
+def test_trim_stale_follows_recent_use(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = [0.0]
+    monkeypatch.setattr(nv_sync.time, "monotonic", lambda: clock[0])
+    room = RoomState(room_id="lru")
+    for idx in range(3):
+        clock[0] = float(idx)
+        room.set_global(f"v{idx}", idx)
+
+    # Re-using the oldest name moves it behind the others.
+    clock[0] = 50.0
+    room.set_global("v0", 10)
+
+    clock[0] = 70.0
+    assert room.name_table.trim_stale(stale_after=60.0) == [2, 3]
+    assert room.name_table.entries() == [(1, "v0")]
+
+
+def test_name_table_crc_uses_canonical_byte_layout() -> None:
+    room = RoomState(room_id="canon")
+    for name in ("alpha", "βeta", "gamma"):
+        room.set_global(name, 0)
+
+    expected = zlib.crc32(
+        b"".join(
+            struct.pack("<H", name_id) + name.encode("utf-8")
+            for name_id, name in room.name_table.entries()
+        )
+    )
+    assert room.name_table.crc32 == expected
+    room.name_table._recompute_crc32()
+    assert room.name_table.crc32 == expected
+
+
+def test_snapshot_maps_encode_integer_keys_natively() -> None:
+    room = RoomState(room_id="ints")
+    room.set_global("a", 1)
+    room.set_client(7, "b", 2)
+
+    encoded = RoomState.encode_payload(room.build_snapshot_payload())
+    # msgpack positive fixints: map {1: 1} and nested {7: {2: 2}}
+    assert b"\x81\x01\x01" in encoded
+    assert b"\x81\x07\x81\x02\x02" in encoded
+
+
+def test_approx_snapshot_bytes_tracks_mutations() -> None:
+    room = RoomState(room_id="size")
+    empty = room.approx_snapshot_bytes()
+
+    room.set_global("title", "x" * 100)
+    with_title = room.approx_snapshot_bytes()
+    assert with_title - empty >= 100 + len("title")
+
+    room.set_global("title", "short")
+    room.set_client(1, "pose", [0.0, 1.0, 2.0])
+    grown = room.approx_snapshot_bytes()
+    assert grown < with_title + 100
+
+    room.delete_global("title")
+    room.delete_client(1, "pose")
+    # Only the (still interned) names remain.
+    assert room.approx_snapshot_bytes() == room.name_table.approx_bytes()
+
+    encoded = len(RoomState.encode_payload(room.build_snapshot_payload()))
+    assert room.approx_snapshot_bytes() <= encoded
+
+
+def test_entries_payload_is_cached_until_table_changes() -> None:
+    room = RoomState(room_id="cache")
+    room.set_global("a", 1)
+
+    first = room.build_snapshot_payload()["nameTable"]["entries"]
+    assert room.build_name_table_full()["entries"] is first
+
+    room.set_global("a", 2)
+    assert room.build_snapshot_payload()["nameTable"]["entries"] is first
+
+    room.set_global("b", 3)
+    refreshed = room.build_snapshot_payload()["nameTable"]["entries"]
+    assert refreshed is not first
+    assert refreshed == [[1, "a"], [2, "b"]]
+
+
+def test_encode_delta_payload_reuses_stream_buffer_cleanly() -> None:
+    room = RoomState(room_id="buffer")
+    room.set_global("a", "x" * 1000)
+    first = room.encode_delta_payload()
+    room.set_global("b", 1)
+    second = room.encode_delta_payload()
+
+    assert first is not None and second is not None
+    assert len(second) < len(first)
+    assert [item["seq"] for item in unpack(second)["items"]] == [2]
+
+    # A failure mid-stream must not leave partial bytes in the shared packer.
+    room.set_global("bad", object())
+    with pytest.raises(TypeError):
+        room.encode_delta_payload()
+    room.set_global("c", 2)
+    assert [item["seq"] for item in unpack(room.encode_delta_payload())["items"]] == [4]
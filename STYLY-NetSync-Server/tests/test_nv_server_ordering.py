@@ -13,6 +13,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from styly_netsync import binary_serializer
 from styly_netsync.server import NetSyncServer
 
 
@@ -66,6 +67,48 @@ class TestGlobalVariableServerOrdering:
         assert server._apply_global_var_set("room1", 2, "a", "1") is False
         assert server.nv_write_seq["room1"] == seq_after_first
 
+    def test_global_sync_payload_cached_until_next_write(
+        self, server: NetSyncServer
+    ) -> None:
+        server._initialize_room("room1")
+        server._apply_global_var_set("room1", 1, "a", "1")
+
+        first = server._build_global_var_sync_payload("room1")
+        assert first is not None
+        assert server._build_global_var_sync_payload("room1") is first
+
+        server._apply_global_var_set("room1", 1, "a", "2")
+        second = server._build_global_var_sync_payload("room1")
+        assert second is not None and second != first
+        _, data, _ = binary_serializer.deserialize(second)
+        assert data is not None
+        assert data["variables"][0]["value"] == "2"
+
+    def test_flush_sends_only_applied_globals_in_list_wire_format(
+        self, server: NetSyncServer
+    ) -> None:
+        server._initialize_room("room1")
+        server._apply_global_var_set("room1", 1, "untouched", "0")
+        for name, value in (("score", "10"), ("mode", "x" * 2000)):
+            server._buffer_global_var_set(
+                "room1",
+                {"senderClientNo": 4, "variableName": name, "variableValue": value},
+            )
+
+        server._flush_nv_drain("room1")
+
+        expected = binary_serializer.serialize_global_var_sync(
+            {
+                "variables": [
+                    {"name": "score", "value": "10", "lastWriterClientNo": 4},
+                    {"name": "mode", "value": "x" * 2000, "lastWriterClientNo": 4},
+                ]
+            }
+        )
+        server._send_ctrl_to_room_via_router.assert_called_once_with(  # type: ignore[attr-defined]
+            "room1", expected
+        )
+
 
 class TestClientVariableServerOrdering:
     def test_last_applied_write_wins(self, server: NetSyncServer) -> None:
@@ -282,9 +282,14 @@ class TestServerObjectOwnership:
         srv.room_id_mapping_dirty = {}
         srv.room_last_id_mapping_broadcast = {}
         srv.client_transform_body_cache = {}
+        srv.room_topic_bytes = {}
+        srv.room_pose_section_cache = {}
+        srv.global_var_sync_cache = {}
+        srv.room_id_mapping_cache = {}
         srv._router_queue_ctrl = MagicMock()
         srv._router_queue_ctrl.put_nowait = MagicMock()
         srv._router_queue_ctrl.get_nowait = MagicMock(side_effect=Exception("empty"))
+        srv._receive_wake_w = MagicMock()
 
         # Stats
         srv.message_count = 0
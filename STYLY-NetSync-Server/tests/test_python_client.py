@@ -522,6 +522,28 @@ def test_stop_from_connection_error_listener():
             pass
 
 
+def test_shared_context_is_not_terminated_on_stop():
+    """Test that a caller-owned ZMQ context survives manager stop()."""
+    import zmq
+
+    context = zmq.Context()
+    manager = net_sync_manager(
+        server="tcp://localhost",
+        dealer_port=_find_free_port(),
+        sub_port=_find_free_port(),
+        room="shared_context_test",
+        context=context,
+    )
+    try:
+        manager.start()
+        assert manager._context is context
+        manager.stop()
+        assert manager._context is None
+        assert not context.closed
+    finally:
+        context.term()
+
+
 if __name__ == "__main__":
     print("Python NetSync Client - Acceptance Criteria Tests")
     print("=" * 50)
@@ -543,3 +565,45 @@ if __name__ == "__main__":
 
         traceback.print_exc()
         exit(1)
+
+
+def test_device_mapping_rebuild_swaps_complete_tables():
+    """Mapping updates replace the lookup tables instead of clearing them."""
+    manager = net_sync_manager()
+    manager._process_device_mapping(
+        {"mappings": [{"deviceId": "dev-a", "clientNo": 1}]}
+    )
+    previous_table = manager._device_to_client
+
+    manager._process_device_mapping(
+        {
+            "mappings": [
+                {"deviceId": "dev-a", "clientNo": 1},
+                {"deviceId": "dev-b", "clientNo": 2, "isStealthMode": True},
+            ]
+        }
+    )
+
+    # A reader holding the old table still sees a complete mapping.
+    assert previous_table == {"dev-a": 1}
+    assert manager.get_client_no("dev-b") == 2
+    assert manager.get_device_id_from_client_no(2) == "dev-b"
+    assert manager.is_client_stealth_mode(2)
+
+
+def test_set_client_variables_queues_each_update_once_ready():
+    """Batch client-variable updates share one readiness check."""
+    manager = net_sync_manager()
+    assert manager.set_client_variables(3, {"a": "1"}) == set()
+
+    manager._running = True
+    manager._dealer_socket = object()
+    manager._client_no = 1
+    try:
+        queued = manager.set_client_variables(3, {"a": "1", "b": "2"})
+    finally:
+        manager._running = False
+        manager._dealer_socket = None
+
+    assert queued == {"a", "b"}
+    assert manager._ctrl_outbox.qsize() == 2
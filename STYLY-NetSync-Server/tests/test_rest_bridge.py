@@ -59,6 +59,36 @@ class TestRestBridgeServerLifecycle:
         fake_thread.join.assert_called_once_with(timeout=2.0)
         fake_socket.close.assert_called_once()
 
+    def test_threadpool_limit_applied_on_first_request(self) -> None:
+        import anyio
+
+        from styly_netsync.rest_bridge import _ThreadpoolLimitMiddleware
+
+        calls: list[str] = []
+
+        async def inner_app(scope, receive, send) -> None:
+            calls.append(scope["type"])
+
+        async def exercise() -> float:
+            wrapped = _ThreadpoolLimitMiddleware(inner_app, 3)
+            await wrapped({"type": "http"}, None, None)
+            await wrapped({"type": "http"}, None, None)
+            return anyio.to_thread.current_default_thread_limiter().total_tokens
+
+        assert anyio.run(exercise) == 3
+        assert calls == ["http", "http"]
+
+    def test_cors_allows_any_origin_without_credentials(self) -> None:
+        tc = TestClient(create_app("localhost", 5555, 5556))
+        resp = tc.get("/", headers={"Origin": "http://example.com"})
+        assert resp.headers["access-control-allow-origin"] == "*"
+        assert "access-control-allow-credentials" not in resp.headers
+
+    def test_run_uvicorn_in_thread_rejects_empty_threadpool(self) -> None:
+        app = create_app("localhost", 5555, 5556)
+        with pytest.raises(ValueError, match="threadpool_size"):
+            run_uvicorn_in_thread(app, host="127.0.0.1", port=0, threadpool_size=0)
+
 
 # ---------------------------------------------------------------------------
 # GlobalVarStore tests
@@ -70,8 +100,7 @@ class TestGlobalVarStore:
         self.store = GlobalVarStore()
 
     def test_upsert_and_get(self) -> None:
-        result = self.store.upsert("room1", {"score": "10"})
-        assert result == {"score": "10"}
+        assert self.store.upsert("room1", {"score": "10"}) is None
         assert self.store.get("room1") == {"score": "10"}
 
     def test_upsert_merges_keys(self) -> None:
@@ -108,6 +137,32 @@ class TestGlobalVarStore:
     def test_pop_unknown_room_returns_empty(self) -> None:
         assert self.store.pop("unknown") == {}
 
+    def test_has_pending_tracks_queue(self) -> None:
+        assert not self.store.has_pending("room1")
+        self.store.upsert("room1", {"a": "1"})
+        assert self.store.has_pending("room1")
+        self.store.pop("room1")
+        assert not self.store.has_pending("room1")
+
+    def test_concurrent_upserts_across_rooms_keep_all_keys(self) -> None:
+        import threading
+
+        rooms = [f"room{i}" for i in range(8)]
+
+        def writer(room_id: str) -> None:
+            for i in range(50):
+                self.store.upsert(room_id, {f"k{i}": str(i)})
+
+        threads = [threading.Thread(target=writer, args=(r,)) for r in rooms * 2]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for room_id in rooms:
+            assert len(self.store.get(room_id)) == 50
+        assert self.store._lock_for("room1") is self.store._lock_for("room1")
+
 
 # ---------------------------------------------------------------------------
 # RoomBridge global variable method tests
@@ -201,6 +256,109 @@ class TestRoomBridgeGlobalVars:
 
         bridge._manager.set_global_variable.assert_not_called()
 
+    def test_apply_now_or_queue_batches_client_updates(self) -> None:
+        bridge = _make_bridge(client_no=1)
+        bridge._manager.get_client_no.return_value = 4
+        bridge._manager.set_client_variables.return_value = {"a"}
+
+        statuses = bridge.apply_now_or_queue("dev", {"a": "1", "b": "2"})
+
+        assert statuses == {"a": "applied", "b": "failed"}
+        bridge._manager.set_client_variables.assert_called_once_with(
+            4, {"a": "1", "b": "2"}
+        )
+
+    def test_wake_flushes_without_waiting_for_idle_timeout(self, monkeypatch) -> None:
+        import threading
+
+        from styly_netsync import rest_bridge
+
+        monkeypatch.setattr(rest_bridge, "BRIDGE_IDLE_WAIT", 30.0)
+        monkeypatch.setattr(rest_bridge, "global_store", GlobalVarStore())
+        bridge = _make_bridge(client_no=1)
+        applied = threading.Event()
+
+        def set_global_variable(name: str, value: str) -> bool:
+            applied.set()
+            return True
+
+        bridge._manager.set_global_variable.side_effect = set_global_variable
+        bridge.start()
+        try:
+            rest_bridge.global_store.upsert("test_room", {"k": "v"})
+            bridge.wake()
+            assert applied.wait(timeout=5.0)
+        finally:
+            bridge.stop()
+
+    def test_bridges_share_one_scheduler_thread(self, monkeypatch) -> None:
+        import threading
+
+        from styly_netsync import rest_bridge
+
+        monkeypatch.setattr(rest_bridge, "BRIDGE_IDLE_WAIT", 30.0)
+        monkeypatch.setattr(rest_bridge, "global_store", GlobalVarStore())
+        applied = {"room_a": threading.Event(), "room_b": threading.Event()}
+        bridges = []
+        for room_id, event in applied.items():
+            bridge = _make_bridge(client_no=1)
+            bridge.room_id = room_id
+            bridge._manager.set_global_variable.side_effect = (
+                lambda name, value, event=event: event.set() or True
+            )
+            bridges.append(bridge)
+
+        try:
+            for bridge in bridges:
+                bridge.start()
+                rest_bridge.global_store.upsert(bridge.room_id, {"k": "v"})
+                bridge.wake()
+            assert all(event.wait(timeout=5.0) for event in applied.values())
+        finally:
+            for bridge in bridges:
+                bridge.stop()
+
+        names = [thread.name for thread in threading.enumerate()]
+        assert names.count("netsync-bridge-scheduler") == 1
+
+
+class TestBridgeManager:
+    def test_get_creates_one_started_bridge_per_room(self) -> None:
+        import threading
+
+        from styly_netsync.rest_bridge import BridgeManager
+
+        created: list[MagicMock] = []
+
+        def make_bridge(*args: object, **kwargs: object) -> MagicMock:
+            bridge = MagicMock()
+            created.append(bridge)
+            return bridge
+
+        manager = BridgeManager("localhost", 5555, 5557, 5556)
+        results: list[object] = []
+        with patch(
+            "styly_netsync.rest_bridge.RoomBridge", side_effect=make_bridge
+        ) as mock_bridge_cls:
+            threads = [
+                threading.Thread(target=lambda: results.append(manager.get("r1")))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            other = manager.get("r2")
+
+        assert len(created) == 2
+        assert all(result is created[0] for result in results)
+        assert other is created[1]
+        created[0].start.assert_called_once_with()
+        # Every room's bridge shares one ZMQ context.
+        contexts = [call.kwargs["context"] for call in mock_bridge_cls.call_args_list]
+        assert contexts[0] is not None
+        assert contexts[0] is contexts[1]
+
 
 # ---------------------------------------------------------------------------
 # Endpoint tests via TestClient
@@ -292,6 +450,20 @@ class TestGlobalVariablesEndpoint:
         finally:
             rest_bridge.global_store = original_store
 
+    def test_post_more_global_vars_than_cap_returns_422(self) -> None:
+        from styly_netsync.rest_bridge import MAX_GLOBAL_VARS
+
+        with patch("styly_netsync.rest_bridge.BridgeManager") as MockBM:
+            app = create_app("localhost", 5555, 5556)
+            tc = TestClient(app)
+            variables = {f"k{i}": "v" for i in range(MAX_GLOBAL_VARS + 1)}
+            resp = tc.post(
+                "/v1/rooms/room1/global-variables",
+                json={"variables": variables},
+            )
+            assert resp.status_code == 422
+            MockBM.return_value.get.assert_not_called()
+
     def test_post_applied_vars_not_stored(self) -> None:
         """Variables that are applied immediately should NOT be stored."""
         from styly_netsync import rest_bridge
@@ -336,6 +508,13 @@ class TestRoomBridgeReadMethods:
         bridge._manager.get_all_global_variables.side_effect = RuntimeError("boom")
         assert bridge.get_global_variables() == {}
 
+    def test_get_global_variable_reads_single_key(self) -> None:
+        bridge = _make_bridge(client_no=1)
+        bridge._manager.get_global_variable.return_value = "1"
+        assert bridge.get_global_variable("a") == "1"
+        bridge._manager.get_global_variable.assert_called_once_with("a")
+        bridge._manager.get_all_global_variables.assert_not_called()
+
     def test_get_client_variables_unmapped_returns_none_and_empty(self) -> None:
         bridge = _make_bridge(client_no=1)
         bridge._manager.get_client_no.return_value = None
@@ -420,15 +599,17 @@ class TestGlobalVariablesGetEndpoint:
 
     def test_get_single_returns_value(self) -> None:
         mock_bridge = MagicMock()
-        mock_bridge.get_global_variables.return_value = {"score": "10"}
+        mock_bridge.get_global_variable.return_value = "10"
         tc = _make_get_client(mock_bridge)
         resp = tc.get("/v1/rooms/room1/global-variables/score")
         assert resp.status_code == 200
         assert resp.json() == {"value": "10"}
+        mock_bridge.get_global_variable.assert_called_once_with("score")
+        mock_bridge.get_global_variables.assert_not_called()
 
     def test_get_single_missing_returns_404(self) -> None:
         mock_bridge = MagicMock()
-        mock_bridge.get_global_variables.return_value = {}
+        mock_bridge.get_global_variable.return_value = None
         tc = _make_get_client(mock_bridge)
         resp = tc.get("/v1/rooms/room1/global-variables/missing")
         assert resp.status_code == 404
@@ -118,6 +118,22 @@ class TestEmptyRoomExpiry:
         assert room_id not in server.room_empty_since
         assert room_id not in server.room_dirty_flags
 
+    def test_room_removal_clears_every_room_scoped_map(
+        self, server: NetSyncServer
+    ) -> None:
+        """Expired rooms leave no entry behind in any per-room structure."""
+        room_id = "initialized_room"
+        server._initialize_room(room_id)
+        server._get_or_assign_client_no(room_id, "device_001")
+        server._apply_global_var_set(room_id, 1, "score", "1")
+        server._build_global_var_sync_payload(room_id)
+
+        server._cleanup_clients(1000.0)
+        server._cleanup_clients(1000.0 + server.EMPTY_ROOM_EXPIRY_TIME + 1)
+
+        for room_map in server._room_scoped_maps():
+            assert room_id not in room_map
+
     def test_room_tracking_cleared_when_client_rejoins(
         self, server: NetSyncServer
     ) -> None:
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import time
 from unittest.mock import MagicMock
 
 import zmq
+from loguru import logger
 
 from styly_netsync import binary_serializer
 from styly_netsync.server import NetSyncServer
@@ -497,6 +499,234 @@ def test_wrong_lane_message_is_dropped() -> None:
         assert "room" not in srv.rooms
 
 
+def test_incoming_drain_counts_every_message_once_per_batch() -> None:
+    """Messages drained in one batch are all counted, including failed ones."""
+    srv = NetSyncServer(enable_server_discovery=False)
+    router = MagicMock()
+    router.recv_multipart.side_effect = [
+        [b"control-1", b"room", b"\xff"],
+        [b"short"],
+        zmq.Again(),
+    ]
+
+    srv._drain_incoming_router(router, "control")
+
+    assert srv.message_count == 2
+
+
+def test_nv_monitor_window_drops_only_stale_timestamps(monkeypatch) -> None:
+    """The NV rate window keeps requests newer than the window size."""
+    srv = NetSyncServer(enable_server_discovery=False)
+    srv.nv_monitor_window_size = 1.0
+    clock = iter([10.0, 10.5, 11.2])
+    monkeypatch.setattr("styly_netsync.server.time.monotonic", lambda: next(clock))
+
+    for _ in range(3):
+        srv._monitor_nv_sliding_window("room")
+
+    assert list(srv.nv_monitor_window["room"]) == [10.5, 11.2]
+
+
+def test_enqueue_router_wakes_receive_loop() -> None:
+    """Queueing a control unicast writes a wakeup byte for the receive poll."""
+    srv = NetSyncServer(enable_server_discovery=False)
+
+    srv._enqueue_router(b"ident-a", "room", b"payload")
+
+    assert srv._receive_wake_r.recv(16) == b"\0"
+
+
+def test_receive_loop_exits_on_wakeup_without_poll_timeout() -> None:
+    """An idle receive loop blocks in poll and still stops promptly."""
+    import threading
+
+    srv = NetSyncServer(enable_server_discovery=False)
+    srv.POLL_TIMEOUT = 60_000
+    srv.running = True
+    thread = threading.Thread(target=srv._receive_loop, daemon=True)
+    thread.start()
+
+    srv.running = False
+    srv._wake_receive_loop()
+    thread.join(timeout=2.0)
+
+    assert not thread.is_alive()
+
+
+def test_room_topic_bytes_cached_for_room_lifetime() -> None:
+    """Known rooms reuse one encoded topic; unknown rooms are not cached."""
+    srv = NetSyncServer(enable_server_discovery=False)
+    srv._initialize_room("room")
+
+    srv._enqueue_router(b"ident-a", "room", b"payload")
+    _, room_bytes, _ = srv._router_queue_ctrl.get_nowait()
+
+    assert room_bytes is srv.room_topic_bytes["room"]
+    assert srv._room_topic("other") == b"other"
+    assert "other" not in srv.room_topic_bytes
+
+
+def test_room_transform_round_trips_cached_client_bodies() -> None:
+    """Room broadcasts frame each cached body with its client number and time."""
+    srv = NetSyncServer(enable_server_discovery=False)
+    pose = binary_serializer.serialize_client_transform(
+        {
+            "deviceId": "device-a",
+            "flags": 0,
+            "head": {},
+            "right": {},
+            "left": {},
+            "physical": {},
+            "virtuals": [],
+        }
+    )
+    _, _, raw = binary_serializer.deserialize(pose)
+    body = srv._extract_transform_body(raw)
+
+    message = srv._serialize_room_transform(
+        "room", [(3, 1.25, None, body), (7, 2.5, None, body)]
+    )
+
+    assert message is not None
+    msg_type, room_data, _ = binary_serializer.deserialize(message)
+    assert msg_type == binary_serializer.MSG_ROOM_POSE
+    assert room_data is not None
+    assert [(c["clientNo"], c["poseTime"]) for c in room_data["clients"]] == [
+        (3, 1.25),
+        (7, 2.5),
+    ]
+
+
+def test_idle_room_rebroadcast_reuses_serialized_clients() -> None:
+    """A clean room is re-sent from its cached client entries."""
+    srv = NetSyncServer(enable_server_discovery=False)
+    pose = binary_serializer.serialize_client_transform(
+        {
+            "deviceId": "device-a",
+            "flags": 0,
+            "head": {},
+            "right": {},
+            "left": {},
+            "physical": {},
+            "virtuals": [],
+        }
+    )
+    _, pose_data, raw = binary_serializer.deserialize(pose)
+    assert pose_data is not None
+    srv._handle_client_transform(b"transform-1", "room", pose_data, raw)
+    published: list[bytes] = []
+    srv._enqueue_pub_latest = lambda topic, message: published.append(message)
+
+    srv._adaptive_broadcast_all_rooms(100.0)
+    section = srv.room_pose_section_cache["room"]
+    srv._serialize_room_pose_clients = MagicMock()
+    srv._adaptive_broadcast_all_rooms(100.0 + srv.idle_broadcast_interval)
+
+    srv._serialize_room_pose_clients.assert_not_called()
+    assert len(published) == 2
+    assert published[1].endswith(section[1])
+    _, first, _ = binary_serializer.deserialize(published[0])
+    _, second, _ = binary_serializer.deserialize(published[1])
+    assert first is not None and second is not None
+    assert first["clients"] == second["clients"]
+
+
+def test_get_or_assign_client_no_fast_path_refreshes_last_seen() -> None:
+    """A mapped device keeps its number and records the caller's timestamp."""
+    srv = NetSyncServer(enable_server_discovery=False)
+    first = srv._get_or_assign_client_no("room", "device-a", 5.0)
+
+    assert srv._get_or_assign_client_no("room", "device-a", 9.0) == first
+    assert srv.device_id_last_seen["device-a"] == 9.0
+    assert srv._get_or_assign_client_no("room", "device-b", 9.5) == first + 1
+
+
+def test_hello_join_log_renders_client_fields() -> None:
+    """The control-lane join log fills in its arguments."""
+    srv = NetSyncServer(enable_server_discovery=False)
+    messages: list[str] = []
+    sink_id = logger.add(messages.append, level="INFO", format="{message}")
+    try:
+        hello = binary_serializer.serialize_client_hello("device-log-1")
+        _, hello_data, _ = binary_serializer.deserialize(hello)
+        assert hello_data is not None
+        srv._handle_client_hello(b"control-1", "log-room", hello_data)
+    finally:
+        logger.remove(sink_id)
+
+    joined = [m for m in messages if "registered control lane" in m]
+    assert joined == [
+        "New client device-l... (client number: 1) registered control lane "
+        "in room log-room\n"
+    ]
+
+
+def test_router_dispatch_warnings_render_arguments() -> None:
+    """Receive-path warnings fill in their arguments instead of printf markers."""
+    srv = NetSyncServer(enable_server_discovery=False)
+    messages: list[str] = []
+    sink_id = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        srv._handle_incoming_router_message("control", [b"ident"])
+        srv._handle_incoming_router_message("control", [b"ident", b"room", b"\xff"])
+        srv._drop_wrong_lane("control", "room", binary_serializer.MSG_CLIENT_POSE)
+    finally:
+        logger.remove(sink_id)
+
+    assert messages == [
+        "Received incomplete control message with 1 parts\n",
+        "Received invalid control-lane message type 255\n",
+        "Dropped wrong-lane message: lane=control room=room "
+        f"msg_type={binary_serializer.MSG_CLIENT_POSE}\n",
+    ]
+
+
+def test_id_mapping_frame_reused_until_mappings_change() -> None:
+    """An unchanged mapping set re-sends the previously serialized frame."""
+    srv = NetSyncServer(enable_server_discovery=False)
+    srv._send_ctrl_to_room_via_router = MagicMock()  # type: ignore[method-assign]
+    room_id = "mapping-room"
+    for device_id in ("device-a", "device-b"):
+        hello = binary_serializer.serialize_client_hello(device_id)
+        _, hello_data, _ = binary_serializer.deserialize(hello)
+        assert hello_data is not None
+        srv._handle_client_hello(device_id.encode(), room_id, hello_data)
+
+    srv._send_ctrl_to_room_via_router.reset_mock()
+    srv._broadcast_id_mappings(room_id)
+    srv._broadcast_id_mappings(room_id)
+    first = srv._send_ctrl_to_room_via_router.call_args_list[0].args[1]
+    second = srv._send_ctrl_to_room_via_router.call_args_list[1].args[1]
+    assert second is first
+
+    with srv._rooms_lock:
+        srv.rooms[room_id]["device-b"]["is_stealth"] = True
+    srv._broadcast_id_mappings(room_id)
+    third = srv._send_ctrl_to_room_via_router.call_args_list[2].args[1]
+    assert third != first
+    _, data, _ = binary_serializer.deserialize(third)
+    assert data is not None
+    assert [m["isStealthMode"] for m in data["mappings"]] == [False, True]
+
+
+def test_periodic_sleep_waits_for_next_deadline_unless_room_dirty() -> None:
+    """Idle rooms sleep until the next deadline; dirty rooms keep the fast tick."""
+    srv = NetSyncServer(enable_server_discovery=False)
+    srv._initialize_room("room")
+    srv.room_dirty_flags["room"] = False
+    now = time.monotonic()
+
+    assert srv._periodic_sleep_time(now + 0.5, now) > srv.MAIN_LOOP_SLEEP
+    assert srv._periodic_sleep_time(now - 1.0, now) == 0.0
+
+    srv.room_dirty_flags["room"] = True
+    assert srv._periodic_sleep_time(now + 0.5, now) <= srv.MAIN_LOOP_SLEEP
+
+    srv.room_dirty_flags["room"] = False
+    srv.room_id_mapping_dirty["room"] = True
+    assert srv._periodic_sleep_time(now + 0.5, now) <= srv.MAIN_LOOP_SLEEP
+
+
 def test_rpc_target_fanout_enqueues_all_ten_targets() -> None:
     """Targeted RPC fanout should enqueue one control unicast per target."""
     srv = NetSyncServer(enable_server_discovery=False)